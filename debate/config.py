@@ -98,13 +98,29 @@ BOOL_CHOICES = ((True, 'Yes'), (False, 'No'))
 class Config(object):
     def __init__(self, tournament):
         self._t = tournament
+        self._values = None
 
     def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
         try:
             return self.get(key)
         except KeyError:
             raise AttributeError(key)
 
+    def __getstate__(self):
+        # Tournaments are pickled into the cache; don't take loaded values with them
+        return {'_t': self._t, '_values': None}
+
+    def as_dict(self):
+        """Returns all of the tournament's stored settings, as strings. They are
+        fetched from the cache the first time they're needed, then kept for as
+        long as the Tournament instance, which for views is a single request."""
+        from debate.models import Config
+        if self._values is None:
+            self._values = Config.objects.get_all(self._t)
+        return self._values
+
     def get(self, key, default=None):
         from debate.models import Config
         if key in SETTINGS:
@@ -124,6 +140,7 @@ class Config(object):
         from debate.models import Config
         if key in SETTINGS:
             Config.objects.set(self._t, key, str(value))
+            self._values = None
         else:
             raise KeyError("Setting {0} does not exist.".format(key))
 
@@ -856,7 +856,8 @@ def make_feedback_form_class_for_adj(source, submission_fields, confirm_on_submi
 
     choices = [(None, '-- Adjudicators --')]
     choices.extend(adj_choice(da) for da in     # for an adjudicator, find every adjudicator on their panel except them.
-            m.DebateAdjudicator.objects.filter(debate__in=debates).exclude(adjudicator=source).select_related('debate').order_by('-debate__round__seq'))
+            m.DebateAdjudicator.objects.filter(debate__in=debates).exclude(adjudicator=source).select_related(
+            'adjudicator', 'debate__round').order_by('-debate__round__seq'))
 
     class FeedbackForm(BaseFeedbackForm):
         tournament = source.tournament  # BaseFeedbackForm setting
@@ -881,18 +882,23 @@ def make_feedback_form_class_for_team(source, submission_fields, confirm_on_subm
     """Constructs a FeedbackForm class specific to the given source team.
     Parameters are as for make_feedback_form_class."""
 
-    # Only include non-silent rounds for teams.
-    debates = m.Debate.objects.filter(debateteam__team=source, round__silent=False,
-        round__draw_status=m.Round.STATUS_RELEASED).order_by('-round__seq')
+    # Only include non-silent rounds for teams. Fetch the chairs and panellists
+    # of all of them at once, grouped by debate.
+    debate_adjudicators = m.DebateAdjudicator.objects.filter(debate__debateteam__team=source,
+        debate__round__silent=False, debate__round__draw_status=m.Round.STATUS_RELEASED,
+        type__in=[m.DebateAdjudicator.TYPE_CHAIR, m.DebateAdjudicator.TYPE_PANEL]).select_related(
+        'adjudicator', 'debate__round').order_by('-debate__round__seq', 'id')
 
     choices = [(None, '-- Adjudicators --')]
-    for debate in debates:
-        try:
-            chair = m.DebateAdjudicator.objects.get(debate=debate, type=m.DebateAdjudicator.TYPE_CHAIR)
-        except m.DebateAdjudicator.DoesNotExist:
+    for _, das in itertools.groupby(debate_adjudicators, key=lambda da: da.debate_id):
+        das = list(das)
+        chairs = [da for da in das if da.type == m.DebateAdjudicator.TYPE_CHAIR]
+        if not chairs:
             continue
-        panel = m.DebateAdjudicator.objects.filter(debate=debate, type=m.DebateAdjudicator.TYPE_PANEL)
-        if panel.exists():
+        chair = chairs[0]
+        debate = chair.debate
+        panel = [da for da in das if da.type == m.DebateAdjudicator.TYPE_PANEL]
+        if panel:
             choices.append((chair.id, '{name} ({r} - chair gave oral)'.format(
                 name=chair.adjudicator.name, r=debate.round.name)))
             for da in panel:
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from debate.models import Tournament, Debate, TeamRoundStanding
+
+class Command(BaseCommand):
+
+    help = "Rebuilds the precomputed team standings from confirmed ballots"
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament', help="Slug of tournament to rebuild standings for")
+
+    def handle(self, *args, **options):
+        try:
+            tournament = Tournament.objects.get(slug=options['tournament'])
+        except Tournament.DoesNotExist:
+            raise CommandError("There is no tournament with slug %r" % options['tournament'])
+
+        debate_ids = Debate.objects.filter(round__tournament=tournament).values_list('id', flat=True)
+        for debate_id in debate_ids:
+            TeamRoundStanding.refresh(debate_id)
+        self.stdout.write("Rebuilt standings for %d debates" % len(debate_ids))
@@ -1,8 +1,9 @@
 import logging
 import random
 import re
+import time
 from django.db import models
-from django.db.models import signals
+from django.db.models import signals, Count
 from django.conf import settings
 from django.core.exceptions import ValidationError, ObjectDoesNotExist, MultipleObjectsReturned
 from django.core.cache import cache
@@ -511,6 +512,20 @@ class BreakingTeam(models.Model):
     class Meta:
         unique_together = [('break_category', 'team')]
 
+class PersonManager(models.Manager):
+
+    def get_checkin_details(self, barcode_id):
+        """Returns a dict with the id, name and checkin_message of the person
+        with this barcode, raising Person.DoesNotExist if there isn't one.
+        Cached, since check-in desks scan the same people every round."""
+        cached_key = "barcode_%d" % barcode_id
+        details = cache.get(cached_key)
+        if details is None:
+            details = self.values('id', 'name', 'checkin_message').get(barcode_id=barcode_id)
+            cache.set(cached_key, details, settings.BARCODE_CACHE_TIMEOUT)
+        return details
+
+
 class Person(models.Model):
     name = models.CharField(max_length=40, db_index=True)
     barcode_id = models.IntegerField(blank=True, null=True)
@@ -532,6 +547,8 @@ class Person(models.Model):
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True, null=True)
     pronoun = models.CharField(max_length=10, blank=True, null=True)
 
+    objects = PersonManager()
+
     @property
     def has_contact(self):
         return bool(self.email or self.phone)
@@ -539,6 +556,18 @@ class Person(models.Model):
     class Meta:
         ordering = ['name']
 
+def record_person_barcode(sender, instance, **kwargs):
+    # If the barcode is changing, the entry for the old one has to go too
+    instance._old_barcode_id = None
+    if instance.pk is not None:
+        instance._old_barcode_id = Person.objects.filter(pk=instance.pk).values_list(
+                'barcode_id', flat=True).first()
+
+def update_person_barcode_cache(sender, instance, **kwargs):
+    barcode_ids = set([instance.barcode_id, getattr(instance, '_old_barcode_id', None)])
+    cache.delete_many(["barcode_%d" % barcode_id for barcode_id in barcode_ids
+            if barcode_id is not None])
+
 
 class Checkin(models.Model):
     person = models.ForeignKey('Person')
@@ -617,9 +646,11 @@ class Adjudicator(Person):
 
 
     def _feedback_score(self):
-        return self.adjudicatorfeedback_set.filter(confirmed=True).exclude(
-                source_adjudicator__type=DebateAdjudicator.TYPE_TRAINEE).aggregate(
-                avg=models.Avg('score'))['avg']
+        if not hasattr(self, '_feedback_score_cache'):
+            self._feedback_score_cache = self.adjudicatorfeedback_set.filter(confirmed=True).exclude(
+                    source_adjudicator__type=DebateAdjudicator.TYPE_TRAINEE).aggregate(
+                    avg=models.Avg('score'))['avg']
+        return self._feedback_score_cache
 
     @property
     def feedback_score(self):
@@ -653,6 +684,28 @@ class Adjudicator(Person):
             )
         return d.count()
 
+def populate_feedback_scores(adjudicators):
+    """Fetches the feedback scores of all the adjudicators in the given
+    queryset in one query, so that their score and feedback_score don't each
+    need a query. Returns the adjudicators as a list. The queryset is used as
+    a subquery, since a list of every adjudicator's id can exceed the
+    database's limit on query parameters."""
+    averages = dict(AdjudicatorFeedback.objects.filter(confirmed=True,
+            adjudicator__in=adjudicators.values('id')).exclude(
+            source_adjudicator__type=DebateAdjudicator.TYPE_TRAINEE).order_by().values_list(
+            'adjudicator').annotate(models.Avg('score')))
+    adjudicators = list(adjudicators)
+    for adj in adjudicators:
+        adj._feedback_score_cache = averages.get(adj.id)
+    return adjudicators
+
+# Forget cached barcode lookups when a person changes (signals aren't sent for
+# parent models, so each subclass is connected separately)
+for model in (Person, Speaker, Adjudicator):
+    signals.pre_save.connect(record_person_barcode, sender=model)
+    signals.post_save.connect(update_person_barcode_cache, sender=model)
+    signals.post_delete.connect(update_person_barcode_cache, sender=model)
+
 
 class AdjudicatorTestScoreHistory(models.Model):
     adjudicator = models.ForeignKey(Adjudicator)
@@ -676,6 +729,44 @@ class AdjudicatorInstitutionConflict(models.Model):
     adjudicator = models.ForeignKey(Adjudicator)
     institution = models.ForeignKey(Institution)
 
+def _new_cache_version():
+    # Counters start from the time in milliseconds, not from zero, so that one
+    # that's been evicted and started again won't repeat an old version
+    return int(time.time() * 1000)
+
+def get_cache_version(version_key):
+    version = cache.get(version_key)
+    if version is None:
+        version = _new_cache_version()
+        cache.add(version_key, version, None)
+        version = cache.get(version_key, version)
+    return version
+
+def increment_cache_version(version_key):
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.add(version_key, _new_cache_version(), None)
+
+def adj_conflicts_cache_key(round):
+    version = get_cache_version("adj_conflicts_version")
+    return "round_%d_adj_conflicts_%d" % (round.id, version)
+
+def update_adj_conflicts_cache(sender, instance, **kwargs):
+    increment_cache_version("adj_conflicts_version")
+
+def adj_history_changed(sender=None, instance=None, **kwargs):
+    """Adjudicators' history with teams comes from the draws of earlier rounds.
+    This is connected to the signals of debates and their teams and
+    adjudicators; views that save those in bulk, which sends no signals, call
+    it once afterwards."""
+    increment_cache_version("adj_conflicts_version")
+
+# Forget cached conflicts when conflicts or teams' institutions change
+for model in (AdjudicatorConflict, AdjudicatorAdjudicatorConflict, AdjudicatorInstitutionConflict, Team):
+    signals.post_save.connect(update_adj_conflicts_cache, sender=model)
+    signals.post_delete.connect(update_adj_conflicts_cache, sender=model)
+
 
 class RoundManager(models.Manager):
     use_for_related_Fields = True
@@ -765,6 +856,15 @@ class Round(models.Model):
     def motions(self):
         return self.motion_set.order_by('seq')
 
+    @cached_property
+    def motion_count(self):
+        cached_key = "round_%d_motion_count" % self.id
+        count = cache.get(cached_key)
+        if count is None:
+            count = self.motion_set.count()
+            cache.set(cached_key, count, None)
+        return count
+
     def draw(self, override_team_checkins=False):
         if self.draw_status != self.STATUS_NONE:
             raise RuntimeError("Tried to run draw on round that already has a draw")
@@ -1284,18 +1384,35 @@ class Debate(models.Model):
         """Returns a dict. Keys are BallotSubmissions, values are lists of
         version numbers of BallotSubmissions that are identical to the key's
         BallotSubmission. Excludes discarded ballots (always)."""
-        ballotsubs = self.ballotsubmission_set_by_version_except_discarded
-        result = {b: list() for b in ballotsubs}
-        for ballotsub1 in ballotsubs:
-            # Save a bit of time by avoiding comparisons already done.
-            # This relies on ballots being ordered by version.
-            for ballotsub2 in ballotsubs.filter(version__gt=ballotsub1.version):
-                if ballotsub1.is_identical(ballotsub2):
-                    result[ballotsub1].append(ballotsub2.version)
-                    result[ballotsub2].append(ballotsub1.version)
-        for l in result.itervalues():
-            l.sort()
-        return result
+        ballotsubs = list(self.ballotsubmission_set_by_version_except_discarded)
+        if len(ballotsubs) < 2:
+            return dict((b, list()) for b in ballotsubs)
+
+        # Rather than comparing every pair of ballots (as is_identical() does),
+        # give each ballot a signature of all its scores and group ballots
+        # with equal signatures. Three queries in total, whatever the number
+        # of ballots.
+        def rows_by_ballotsub(model, fields):
+            rows = dict((b.id, list()) for b in ballotsubs)
+            for row in model.objects.filter(ballot_submission__in=rows.keys()).values_list(
+                    'ballot_submission_id', *fields):
+                rows[row[0]].append(row[1:])
+            return rows
+        speakerscorebyadjs = rows_by_ballotsub(SpeakerScoreByAdj,
+                ('debate_adjudicator_id', 'debate_team_id', 'position', 'score'))
+        speakerscores = rows_by_ballotsub(SpeakerScore,
+                ('debate_team_id', 'speaker_id', 'position', 'score'))
+        teamscores = rows_by_ballotsub(TeamScore, ('debate_team_id', 'points', 'score'))
+
+        def signature(b):
+            return (b.motion_id, tuple(sorted(speakerscorebyadjs[b.id])),
+                    tuple(sorted(speakerscores[b.id])), tuple(sorted(teamscores[b.id])))
+        signatures = dict((b, signature(b)) for b in ballotsubs)
+        versions = dict()
+        for b in ballotsubs: # ordered by version, so each list is already sorted
+            versions.setdefault(signatures[b], list()).append(b.version)
+
+        return dict((b, [v for v in versions[signatures[b]] if v != b.version]) for b in ballotsubs)
 
     @property
     def flags_all(self):
@@ -1421,6 +1538,24 @@ class DebateAdjudicator(models.Model):
     def __unicode__(self):
         return u'%s %s' % (self.adjudicator, self.debate)
 
+# Forget cached conflicts when a draw is edited, e.g. in the admin. The
+# receivers don't query, so deleting these in bulk stays cheap.
+for model in (Debate, DebateTeam, DebateAdjudicator):
+    signals.post_save.connect(adj_history_changed, sender=model)
+    signals.post_delete.connect(adj_history_changed, sender=model)
+
+def update_draw_version(sender=None, instance=None, **kwargs):
+    """Changes the public draw pages' ETag. This is connected to the signals of
+    everything they show; views that save debates in bulk, which sends no
+    signals, call it once afterwards."""
+    increment_cache_version("draw_version")
+
+# Change the public draw pages' ETag when anything they show is edited
+for model in (Round, Institution, Team, Adjudicator, VenueGroup, Venue, Division, Debate, DebateTeam,
+        DebateAdjudicator):
+    signals.post_save.connect(update_draw_version, sender=model)
+    signals.post_delete.connect(update_draw_version, sender=model)
+
 
 class TeamPositionAllocation(models.Model):
     """Model to store team position allocations for tournaments like Joynt
@@ -1659,6 +1794,18 @@ class AdjudicatorFeedback(Submission):
             raise ValidationError("Adjudicator did not see this debate")
         super(AdjudicatorFeedback, self).clean()
 
+def adj_scores_cache_key(tournament_id, round_seq):
+    version = get_cache_version("adj_scores_version")
+    return "tournament_%d_round_%d_adj_scores_%d" % (tournament_id, round_seq, version)
+
+def update_adj_scores_cache(sender, instance, **kwargs):
+    increment_cache_version("adj_scores_version")
+
+# Forget cached adjudicator scores when anything they're calculated from changes
+for model in (Adjudicator, AdjudicatorTestScoreHistory, AdjudicatorFeedback, Round):
+    signals.post_save.connect(update_adj_scores_cache, sender=model)
+    signals.post_delete.connect(update_adj_scores_cache, sender=model)
+
 
 class AdjudicatorAllocation(object):
     """Not a model, just a container object for the adjudicators on a panel."""
@@ -1717,6 +1864,25 @@ class AdjudicatorAllocation(object):
             if adj:
                 DebateAdjudicator(debate=self.debate, adjudicator_id=adj, type=t).save()
 
+def populate_adjudicators(debates, *related):
+    """Sets debate.adjudicators on every debate in the given list using one
+    query, rather than one query per debate. Any other arguments are passed
+    to select_related() on the DebateAdjudicators. Returns the list."""
+    allocations = dict((debate.id, AdjudicatorAllocation(debate)) for debate in debates)
+    debate_adjudicators = DebateAdjudicator.objects.filter(debate__in=debates).select_related(
+            'adjudicator', *related)
+    for da in debate_adjudicators:
+        allocation = allocations[da.debate_id]
+        if da.type == da.TYPE_CHAIR:
+            allocation.chair = da.adjudicator
+        elif da.type == da.TYPE_PANEL:
+            allocation.panel.append(da.adjudicator)
+        elif da.type == da.TYPE_TRAINEE:
+            allocation.trainees.append(da.adjudicator)
+    for debate in debates:
+        debate.adjudicators = allocations[debate.id]
+    return debates
+
 
 class BallotSubmission(Submission):
     """Represents a single submission of ballots for a debate.
@@ -1844,6 +2010,88 @@ class TeamScore(models.Model):
         unique_together = [('debate_team', 'ballot_submission')]
 
 
+class TeamRoundStanding(models.Model):
+    """Precomputed copy of a team's confirmed result in a round, so that the
+    team tab can be read in a single query. Rows are rebuilt from the
+    confirmed TeamScores by update_team_round_standings() whenever a
+    BallotSubmission is saved or deleted; they should never be edited
+    directly."""
+    team = models.ForeignKey(Team, related_name='round_standings')
+    round = models.ForeignKey(Round)
+    debate_team = models.ForeignKey(DebateTeam)
+    opposition = models.ForeignKey(Team, blank=True, null=True, related_name='+')
+    points = models.PositiveSmallIntegerField()
+    margin = ScoreField()
+    win = models.NullBooleanField()
+    score = ScoreField()
+    affects_averages = models.BooleanField(default=True)
+
+    class Meta:
+        unique_together = [('team', 'round')]
+
+    # Same interface as TeamScore, so that templates can use either
+    get_margin = TeamScore.get_margin
+    get_score = TeamScore.get_score
+
+    @classmethod
+    def refresh(cls, debate_id):
+        """Rebuilds the standings for all teams in the given debate from its
+        confirmed ballot, if there is one."""
+        cls.objects.filter(debate_team__debate_id=debate_id).delete()
+        dts = list(DebateTeam.objects.filter(debate_id=debate_id).select_related('debate'))
+        scores = dict((ts.debate_team_id, ts) for ts in TeamScore.objects.filter(
+                debate_team__debate_id=debate_id, ballot_submission__confirmed=True))
+        standings = []
+        for dt in dts:
+            ts = scores.get(dt.id)
+            if ts is None:
+                continue
+            opposition = [other.team_id for other in dts if other.id != dt.id]
+            standings.append(cls(team_id=dt.team_id, round_id=dt.debate.round_id,
+                    debate_team=dt, opposition_id=opposition[0] if opposition else None,
+                    points=ts.points, margin=ts.margin, win=ts.win, score=ts.score,
+                    affects_averages=ts.affects_averages))
+        cls.objects.bulk_create(standings)
+
+    @classmethod
+    def backfill(cls, rounds):
+        """Builds the standings for any debate in the given rounds that has a
+        confirmed ballot but no standings yet, such as ballots confirmed
+        before this table existed."""
+        missing = Debate.objects.filter(round__in=rounds, ballotsubmission__confirmed=True).exclude(
+                debateteam__teamroundstanding__isnull=False).values_list('id', flat=True).distinct()
+        for debate_id in missing:
+            cls.refresh(debate_id)
+
+def update_team_round_standings(sender, instance, **kwargs):
+    if sender is TeamScore:
+        debate_id = DebateTeam.objects.filter(id=instance.debate_team_id).values_list(
+                'debate_id', flat=True).first()
+        if debate_id is None: # the debate team is being deleted too
+            return
+    else:
+        debate_id = instance.debate_id
+    # Draws are edited well before they have results, so don't rebuild the
+    # standings of every debate team saved or deleted then
+    if sender is DebateTeam and not TeamRoundStanding.objects.filter(
+            debate_team__debate_id=debate_id).exists():
+        return
+    TeamRoundStanding.refresh(debate_id)
+
+# Rebuild the precomputed standings when a ballot is (un)confirmed, or when
+# its scores or the debate's teams are edited, e.g. in the admin
+for model in (BallotSubmission, TeamScore, DebateTeam):
+    signals.post_save.connect(update_team_round_standings, sender=model)
+    signals.post_delete.connect(update_team_round_standings, sender=model)
+
+def backfill_team_round_standings(sender, app_config, **kwargs):
+    if app_config.label == 'debate':
+        TeamRoundStanding.backfill(Round.objects.all())
+
+# Fill in standings for ballots confirmed before the table existed
+signals.post_migrate.connect(backfill_team_round_standings)
+
+
 class SpeakerScoreManager(models.Manager):
     use_for_related_fields = True
 
@@ -1870,29 +2118,61 @@ class SpeakerScore(models.Model):
     class Meta:
         unique_together = [('debate_team', 'speaker', 'position', 'ballot_submission')]
 
+def speaker_standings_cache_key(round_id, only_novices, for_replies):
+    return "round_%d_speaker_standings_%d_%d" % (round_id, only_novices, for_replies)
+
+def clear_speaker_standings_cache(tournament_id):
+    round_ids = Round.objects.filter(tournament_id=tournament_id).values_list('id', flat=True)
+    cache.delete_many([speaker_standings_cache_key(round_id, only_novices, for_replies)
+            for round_id in round_ids for only_novices in (False, True) for for_replies in (False, True)])
+
+def tab_version_key(tournament_id):
+    return "tournament_%d_tab_version" % tournament_id
+
+def update_speaker_standings_cache(sender, instance, **kwargs):
+    if sender is BallotSubmission:
+        tournament_id = instance.debate.round.tournament_id
+    elif sender is Speaker:
+        tournament_id = instance.team.tournament_id
+    else:
+        tournament_id = instance.tournament_id
+    clear_speaker_standings_cache(tournament_id)
+
+# Forget cached speaker standings when anything they're calculated from changes
+for model in (BallotSubmission, Speaker, Team):
+    signals.post_save.connect(update_speaker_standings_cache, sender=model)
+    signals.post_delete.connect(update_speaker_standings_cache, sender=model)
+
 
 class MotionManager(models.Manager):
 
-    def statistics(self, round):
+    def statistics(self, round, only_round=False):
+        """Returns the motions up to and including the given round (or, if
+        only_round is True, only that round's motions), annotated with the
+        number of times each side won and vetoed them."""
         #from scipy.stats import chisquare
 
-        motions = self.select_related('round').filter(round__seq__lte=round.seq, round__tournament=round.tournament)
+        if only_round:
+            motions = self.filter(round=round)
+            in_rounds = dict(ballot_submission__debate__round=round)
+        else:
+            motions = self.filter(round__seq__lte=round.seq, round__tournament=round.tournament)
+            in_rounds = dict(ballot_submission__debate__round__tournament=round.tournament,
+                    ballot_submission__debate__round__seq__lte=round.seq)
+        motions = list(motions.select_related('round'))
+
+        def count_by_position(queryset, motion_field):
+            """Returns {(position, motion_id): count}, counted by the database."""
+            return dict(((position, motion_id), count) for position, motion_id, count in
+                    queryset.order_by().values_list('debate_team__position', motion_field).annotate(Count('id')))
 
-        winners = TeamScore.objects.filter(
-                win=True, ballot_submission__confirmed=True,
-                ballot_submission__debate__round__tournament=round.tournament,
-                ballot_submission__debate__round__seq__lte=round.seq).select_related(
-                'debate_team__position', 'ballot_submission__motion')
-        wins = dict()
-        for pos, _ in DebateTeam.POSITION_CHOICES:
-            wins[pos] = dict.fromkeys(motions, 0)
-        for winner in winners:
-            wins[winner.debate_team.position][winner.ballot_submission.motion] += 1
+        wins = count_by_position(TeamScore.objects.filter(win=True,
+                ballot_submission__confirmed=True, **in_rounds), 'ballot_submission__motion')
 
         for motion in motions:
-            motion.aff_wins = wins[DebateTeam.POSITION_AFFIRMATIVE][motion]
-            motion.neg_wins = wins[DebateTeam.POSITION_NEGATIVE][motion]
-            motion.chosen_in = sum(wins[pos][motion] for pos, _ in DebateTeam.POSITION_CHOICES)
+            motion.aff_wins = wins.get((DebateTeam.POSITION_AFFIRMATIVE, motion.id), 0)
+            motion.neg_wins = wins.get((DebateTeam.POSITION_NEGATIVE, motion.id), 0)
+            motion.chosen_in = sum(wins.get((pos, motion.id), 0) for pos, _ in DebateTeam.POSITION_CHOICES)
 
             # motion.c1, motion.p_value = chisquare([motion.aff_wins, motion.neg_wins], f_exp=[motion.chosen_in / 2, motion.chosen_in / 2])
             # # Culling out the NaN errors
@@ -1904,20 +2184,12 @@ class MotionManager(models.Manager):
             motion.c1, motion.p_value = None, None
 
         if round.tournament.config.get('motion_vetoes_enabled'):
-            veto_objs = DebateTeamMotionPreference.objects.filter(
-                    preference=3, ballot_submission__confirmed=True,
-                    ballot_submission__debate__round__tournament=round.tournament,
-                    ballot_submission__debate__round__seq__lte=round.seq).select_related(
-                    'debate_team__position', 'ballot_submission__motion')
-            vetoes = dict()
-            for pos, _ in DebateTeam.POSITION_CHOICES:
-                vetoes[pos] = dict.fromkeys(motions, 0)
-            for veto in veto_objs:
-                vetoes[veto.debate_team.position][veto.motion] += 1
+            vetoes = count_by_position(DebateTeamMotionPreference.objects.filter(preference=3,
+                    ballot_submission__confirmed=True, **in_rounds), 'motion')
 
             for motion in motions:
-                motion.aff_vetoes = vetoes[DebateTeam.POSITION_AFFIRMATIVE][motion]
-                motion.neg_vetoes = vetoes[DebateTeam.POSITION_NEGATIVE][motion]
+                motion.aff_vetoes = vetoes.get((DebateTeam.POSITION_AFFIRMATIVE, motion.id), 0)
+                motion.neg_vetoes = vetoes.get((DebateTeam.POSITION_NEGATIVE, motion.id), 0)
 
         return motions
 
@@ -1939,6 +2211,13 @@ class Motion(models.Model):
     def __unicode__(self):
         return self.text
 
+def update_motion_count_cache(sender, instance, **kwargs):
+    cache.delete("round_%d_motion_count" % instance.round_id)
+
+# Recount the round's motions when one is saved or deleted
+signals.post_save.connect(update_motion_count_cache, sender=Motion)
+signals.post_delete.connect(update_motion_count_cache, sender=Motion)
+
 
 class DebateTeamMotionPreference(models.Model):
     """Represents a motion preference submitted by a debate team."""
@@ -2136,27 +2415,22 @@ class ConfigManager(models.Manager):
     def set(self, tournament, key, value):
         obj, created = self.get_or_create(tournament=tournament, key=key)
         obj.value = value
-        obj.save()
-        #print "set config cache via set() call"
-        cached_key = "%s_%s" % (tournament.slug, key)
-        cache.set(cached_key, value, None)
+        obj.save() # update_config_cache() forgets the cached settings
+
+    def get_all(self, tournament):
+        """Returns all of the tournament's settings as a dict. They are cached
+        together, so that a cold cache costs one query rather than one per
+        setting."""
+        cached_key = config_cache_key(tournament.id)
+        values = cache.get(cached_key)
+        if values is None:
+            values = dict(self.filter(tournament=tournament).values_list('key', 'value'))
+            cache.set(cached_key, values, None)
+        return values
 
     def get_(self, tournament, key, default=None):
-        cached_key = "%s_%s" % (tournament.slug, key)
-        cached_value = cache.get(cached_key)
-        if cached_value:
-            return cached_value
-        else:
-            #print "couldnt get cache key %s" % cached_key
-            #print "\t value is %s" % cache.get(cached_key)
-            try:
-                noncached_value = self.get(tournament=tournament, key=key).value
-            except ObjectDoesNotExist:
-                noncached_value = default
-
-            cache.set(cached_key, noncached_value, None)
-            #print "\tset config cache %s to %s via get() call" % (cached_key, noncached_value)
-            return noncached_value
+        values = tournament.config.as_dict()
+        return values[key] if key in values else default
 
 
 class Config(models.Model):
@@ -2165,3 +2439,37 @@ class Config(models.Model):
     value = models.CharField(max_length=40)
 
     objects = ConfigManager()
+
+def config_cache_key(tournament_id):
+    return "tournament_%d_config" % tournament_id
+
+def update_config_cache(sender, instance, **kwargs):
+    cache.delete(config_cache_key(instance.tournament_id))
+
+signals.post_save.connect(update_config_cache, sender=Config)
+signals.post_delete.connect(update_config_cache, sender=Config)
+
+# Speaker standings depend on the missed debates and ranking settings
+signals.post_save.connect(update_speaker_standings_cache, sender=Config)
+signals.post_delete.connect(update_speaker_standings_cache, sender=Config)
+
+
+def update_tab_version(sender, instance, **kwargs):
+    if sender is BallotSubmission:
+        tournament_ids = [instance.debate.round.tournament_id]
+    elif sender is Speaker:
+        tournament_ids = [instance.team.tournament_id]
+    elif sender is Motion:
+        tournament_ids = [instance.round.tournament_id]
+    elif sender is Institution:
+        # Institutions aren't tied to a tournament
+        tournament_ids = Tournament.objects.values_list('id', flat=True)
+    else:
+        tournament_ids = [instance.tournament_id]
+    for tournament_id in tournament_ids:
+        increment_cache_version(tab_version_key(tournament_id))
+
+# Change the public tabs' ETag when anything they show is saved or deleted
+for model in (BallotSubmission, Speaker, Team, Institution, Round, Motion, Config):
+    signals.post_save.connect(update_tab_version, sender=model)
+    signals.post_delete.connect(update_tab_version, sender=model)
@@ -0,0 +1,251 @@
+"""Tests that cached values are forgotten when the rows they come from change."""
+
+import time
+from django.core.cache import cache
+from django.test import TestCase
+import debate.models as m
+
+class BaseCacheTestCase(TestCase):
+
+    def setUp(self):
+        super(BaseCacheTestCase, self).setUp()
+        cache.clear() # the cache isn't rolled back between tests
+        self.t = m.Tournament.objects.create(slug="tournament")
+
+class TestConfigCache(BaseCacheTestCase):
+
+    def test_set(self):
+        self.assertEqual(self.t.config.get('score_min'), 68)
+        self.t.config.set('score_min', 60)
+        self.assertEqual(self.t.config.get('score_min'), 60)
+
+    def test_falsy_value(self):
+        m.Config.objects.create(tournament=self.t, key='public_password', value='')
+        self.assertEqual(m.Config.objects.get_(self.t, 'public_password', 'default'), '')
+
+    def test_memoised(self):
+        self.t.config.get('score_min')
+        with self.assertNumQueries(0):
+            self.t.config.get('score_max')
+            self.t.config.get('public_draw')
+
+    def test_delete(self):
+        self.t.config.set('score_min', 60)
+        m.Config.objects.filter(tournament=self.t, key='score_min').get().delete()
+        self.assertEqual(m.Tournament.objects.get(id=self.t.id).config.get('score_min'), 68)
+
+class TestBarcodeCache(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestBarcodeCache, self).setUp()
+        self.inst = m.Institution.objects.create(code="INS", name="Institution")
+        self.adj = m.Adjudicator.objects.create(tournament=self.t, institution=self.inst,
+                name="Adjudicator", test_score=0, barcode_id=1234)
+
+    def test_rename(self):
+        self.assertEqual(m.Person.objects.get_checkin_details(1234)['name'], "Adjudicator")
+        self.adj.name = "Renamed"
+        self.adj.save()
+        self.assertEqual(m.Person.objects.get_checkin_details(1234)['name'], "Renamed")
+
+    def test_change_barcode(self):
+        m.Person.objects.get_checkin_details(1234)
+        self.adj.barcode_id = 5678
+        self.adj.save()
+        self.assertRaises(m.Person.DoesNotExist, m.Person.objects.get_checkin_details, 1234)
+        self.assertEqual(m.Person.objects.get_checkin_details(5678)['id'], self.adj.id)
+
+    def test_delete(self):
+        m.Person.objects.get_checkin_details(1234)
+        self.adj.delete()
+        self.assertRaises(m.Person.DoesNotExist, m.Person.objects.get_checkin_details, 1234)
+
+class TestAdjScoresCache(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestAdjScoresCache, self).setUp()
+        self.inst = m.Institution.objects.create(code="INS", name="Institution")
+        self.round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+        self.key = m.adj_scores_cache_key(self.t.id, 1)
+
+    def test_adjudicator_saved(self):
+        adj = m.Adjudicator.objects.create(tournament=self.t, institution=self.inst,
+                name="Adjudicator", test_score=0)
+        self.assertNotEqual(m.adj_scores_cache_key(self.t.id, 1), self.key)
+        key = m.adj_scores_cache_key(self.t.id, 1)
+        adj.delete()
+        self.assertNotEqual(m.adj_scores_cache_key(self.t.id, 1), key)
+
+    def test_round_saved(self):
+        self.round.feedback_weight = 0.5
+        self.round.save()
+        self.assertNotEqual(m.adj_scores_cache_key(self.t.id, 1), self.key)
+
+    def test_version_evicted(self):
+        time.sleep(0.002) # new versions are seeded from the time in milliseconds
+        cache.delete("adj_scores_version")
+        self.assertNotEqual(m.adj_scores_cache_key(self.t.id, 1), self.key)
+
+class TestAdjConflictsCache(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestAdjConflictsCache, self).setUp()
+        self.inst = m.Institution.objects.create(code="INS", name="Institution")
+        self.team = m.Team.objects.create(tournament=self.t, institution=self.inst, reference="Team")
+        self.adj = m.Adjudicator.objects.create(tournament=self.t, institution=self.inst,
+                name="Adjudicator", test_score=0)
+        self.round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+        self.key = m.adj_conflicts_cache_key(self.round)
+
+    def test_conflict_saved(self):
+        conflict = m.AdjudicatorConflict.objects.create(adjudicator=self.adj, team=self.team)
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), self.key)
+        key = m.adj_conflicts_cache_key(self.round)
+        conflict.delete()
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), key)
+
+    def test_history_changed(self):
+        m.adj_history_changed()
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), self.key)
+
+    def test_draw_edited(self):
+        debate = m.Debate.objects.create(round=self.round)
+        key = m.adj_conflicts_cache_key(self.round)
+        da = m.DebateAdjudicator.objects.create(debate=debate, adjudicator=self.adj,
+                type=m.DebateAdjudicator.TYPE_CHAIR)
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), key)
+        key = m.adj_conflicts_cache_key(self.round)
+        da.delete()
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), key)
+        key = m.adj_conflicts_cache_key(self.round)
+        m.DebateTeam.objects.create(debate=debate, team=self.team, position=m.DebateTeam.POSITION_AFFIRMATIVE)
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), key)
+
+    def test_version_evicted(self):
+        time.sleep(0.002) # new versions are seeded from the time in milliseconds
+        cache.delete("adj_conflicts_version")
+        self.assertNotEqual(m.adj_conflicts_cache_key(self.round), self.key)
+
+class TestTabVersion(BaseCacheTestCase):
+
+    def test_team_saved(self):
+        inst = m.Institution.objects.create(code="INS", name="Institution")
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        m.Team.objects.create(tournament=self.t, institution=inst, reference="Team")
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+
+    def test_config_saved(self):
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        self.t.config.set('team_standings_rule', 'nz')
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+
+    def test_config_deleted(self):
+        self.t.config.set('team_standings_rule', 'nz')
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        m.Config.objects.filter(tournament=self.t, key='team_standings_rule').delete()
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+
+    def test_round_and_motion_saved(self):
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        motion = m.Motion.objects.create(round=round, seq=1, reference="Motion", text="THW test")
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        motion.delete()
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+
+    def test_institution_saved(self):
+        version = m.get_cache_version(m.tab_version_key(self.t.id))
+        m.Institution.objects.create(code="INS", name="Institution")
+        self.assertNotEqual(m.get_cache_version(m.tab_version_key(self.t.id)), version)
+
+class TestMotionCountCache(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestMotionCountCache, self).setUp()
+        self.round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+
+    def motion_count(self):
+        # motion_count is a cached_property, so use a new instance each time
+        return m.Round.objects.get(id=self.round.id).motion_count
+
+    def test_motion_saved_and_deleted(self):
+        self.assertEqual(self.motion_count(), 0)
+        motion = m.Motion.objects.create(round=self.round, seq=1, reference="Motion", text="THW test")
+        self.assertEqual(self.motion_count(), 1)
+        motion.delete()
+        self.assertEqual(self.motion_count(), 0)
+
+class TestSpeakerStandingsCache(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestSpeakerStandingsCache, self).setUp()
+        inst = m.Institution.objects.create(code="INS", name="Institution")
+        self.team = m.Team.objects.create(tournament=self.t, institution=inst, reference="Team")
+        self.speaker = m.Speaker.objects.create(team=self.team, name="Speaker")
+        self.round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+        self.debate = m.Debate.objects.create(round=self.round)
+        self.keys = [m.speaker_standings_cache_key(self.round.id, only_novices, for_replies)
+                for only_novices in (False, True) for for_replies in (False, True)]
+        for key in self.keys:
+            cache.set(key, "standings")
+
+    def assertCleared(self):
+        for key in self.keys:
+            self.assertIsNone(cache.get(key))
+
+    def test_speaker_saved(self):
+        self.speaker.novice = True
+        self.speaker.save()
+        self.assertCleared()
+
+    def test_speaker_deleted(self):
+        self.speaker.delete()
+        self.assertCleared()
+
+    def test_team_saved(self):
+        self.team.reference = "Renamed"
+        self.team.save()
+        self.assertCleared()
+
+    def test_config_saved(self):
+        self.t.config.set('standings_missed_debates', 0)
+        self.assertCleared()
+
+    def test_ballot_saved_and_deleted(self):
+        ballotsub = m.BallotSubmission.objects.create(debate=self.debate,
+                submitter_type=m.BallotSubmission.SUBMITTER_TABROOM)
+        self.assertCleared()
+        for key in self.keys:
+            cache.set(key, "standings")
+        ballotsub.delete()
+        self.assertCleared()
+
+class TestDrawVersion(BaseCacheTestCase):
+
+    def setUp(self):
+        super(TestDrawVersion, self).setUp()
+        self.inst = m.Institution.objects.create(code="INS", name="Institution")
+        self.round = m.Round.objects.create(tournament=self.t, seq=1, abbreviation="R1")
+        self.debate = m.Debate.objects.create(round=self.round)
+
+    def assertChanges(self, fn):
+        version = m.get_cache_version("draw_version")
+        fn()
+        self.assertNotEqual(m.get_cache_version("draw_version"), version)
+
+    def test_draw_edited(self):
+        team = m.Team.objects.create(tournament=self.t, institution=self.inst, reference="Team")
+        self.assertChanges(lambda: m.DebateTeam.objects.create(debate=self.debate, team=team,
+                position=m.DebateTeam.POSITION_AFFIRMATIVE))
+        self.assertChanges(lambda: m.DebateTeam.objects.all().delete())
+
+    def test_names_edited(self):
+        adj = m.Adjudicator.objects.create(tournament=self.t, institution=self.inst,
+                name="Adjudicator", test_score=0)
+        adj.name = "Renamed"
+        self.assertChanges(adj.save)
+        self.inst.code = "NEW"
+        self.assertChanges(self.inst.save)
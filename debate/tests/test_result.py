@@ -198,6 +198,40 @@ class CommonTests(object):
     def test_winner(self, ballotset, testdata):
         self.assertEqual(ballotset.winner, self.teams[testdata['winner']])
 
+    @on_all_datasets
+    def test_team_round_standings(self, ballotset, testdata):
+        standings = m.TeamRoundStanding.objects.filter(round=self.round)
+        self.assertEqual(standings.count(), 2)
+        for i, team in enumerate(self.teams):
+            standing = standings.get(team=team)
+            self.assertEqual(standing.win, i == testdata['winner'])
+            self.assertEqual(standing.opposition, self.teams[1-i])
+
+    @on_all_datasets
+    def test_team_round_standings_follow_teamscore(self, ballotset, testdata):
+        ts = m.TeamScore.objects.filter(ballot_submission__confirmed=True, debate_team__debate=self.debate)[0]
+        ts.points = 7
+        ts.save()
+        self.assertEqual(m.TeamRoundStanding.objects.get(debate_team=ts.debate_team).points, 7)
+
+    @on_all_datasets
+    def test_team_round_standings_backfill(self, ballotset, testdata):
+        m.TeamRoundStanding.objects.all().delete()
+        m.TeamRoundStanding.backfill([self.round])
+        self.assertEqual(m.TeamRoundStanding.objects.filter(round=self.round).count(), 2)
+
+    def test_identical_ballotsubs_dict(self):
+        for testdata in self.testdata.itervalues():
+            self.save_complete_ballotset(self.teams_input, testdata)
+            self.save_complete_ballotset(self.teams_input, testdata)
+        ballotsubs = self.debate.ballotsubmission_set_by_version_except_discarded
+        identical = self.debate.identical_ballotsubs_dict
+        self.assertEqual(len(identical), ballotsubs.count())
+        for b1 in ballotsubs:
+            expected = [b2.version for b2 in ballotsubs if b2 != b1 and b1.is_identical(b2)]
+            self.assertEqual(identical[b1], expected)
+            self.assertTrue(len(identical[b1]) >= 1)
+
     @on_all_datasets
     def test_winner_by_side(self, ballotset, testdata):
         self.assertEqual(ballotset.aff_win, testdata['winner'] == 0)
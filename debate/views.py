@@ -1,4 +1,4 @@
-from django.http import Http404, HttpResponseRedirect, HttpResponse, HttpResponseBadRequest
+from django.http import Http404, HttpResponseRedirect, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render_to_response, get_object_or_404, redirect
 from django.template import Context, RequestContext, loader, Template
 from django.template.loader import render_to_string
@@ -6,9 +6,11 @@ from django.core.urlresolvers import reverse
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
 from django.contrib.auth.decorators import user_passes_test, login_required
 from django.contrib import messages
-from django.db.models import Sum, Count
+from django.db.models import Sum, Count, Case, When, Value, IntegerField, Prefetch
 from django.conf import settings
+from django.core.cache import cache
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
 from ipware.ip import get_real_ip
 
 from debate.result import BallotSet
@@ -21,7 +23,10 @@ from django.forms.models import modelformset_factory, formset_factory
 from django.forms import Textarea
 
 import datetime
+import hashlib
 from functools import wraps
+from itertools import groupby
+from operator import attrgetter
 import json
 from standings import PRECEDENCE_BY_RULE
 
@@ -40,6 +45,37 @@ def relevant_team_standings_metrics(tournament):
     metrics["who_beat_whom"] = "wbw" in precedence
     return metrics
 
+def set_wins_and_points(team, avg_margin=False):
+    """Sets team.wins and team.points from team.round_results in one pass.
+    If avg_margin is True, also sets team.avg_margin in the same pass."""
+    team.wins = team.points = 0
+    margins = []
+    for ts in team.round_results:
+        if ts:
+            if ts.win:
+                team.wins += 1
+            team.points += ts.points
+            if avg_margin and ts.get_margin is not None:
+                margins.append(ts.get_margin)
+    if avg_margin:
+        team.avg_margin = sum(margins) / float(len(margins)) if margins else None
+
+def confirmed_team_scores(rounds):
+    """Returns a dict mapping (team_id, round_id) to the confirmed TeamScore
+    for that team in that round, with ts.opposition set to the opposing Team."""
+    team_scores = TeamScore.objects.filter(ballot_submission__confirmed=True,
+        debate_team__debate__round__in=rounds).select_related('debate_team__debate').prefetch_related(
+        Prefetch('debate_team__debate__debateteam_set', queryset=DebateTeam.objects.select_related('team')))
+    team_scores = dict(((ts.debate_team.team_id, ts.debate_team.debate.round_id), ts) for ts in team_scores)
+
+    # Find oppositions from the prefetched debate teams, not a query per score
+    for ts in team_scores.itervalues():
+        others = [dt for dt in ts.debate_team.debate.debateteam_set.all() if dt.id != ts.debate_team_id]
+        if len(others) == 1:
+            ts.opposition = others[0].team
+
+    return team_scores
+
 def redirect_round(to, round, **kwargs):
     return redirect(to, tournament_slug=round.tournament.slug,
                     round_seq=round.seq, *kwargs)
@@ -84,6 +120,47 @@ def public_optional_round_view(config_option):
         return foo
     return bar
 
+def cache_page_with_etag(timeout, etag_func):
+    """Like cache_page, but also answers conditional GETs. Pages are cached
+    under their ETag, so that a page cached before the data changed is never
+    sent out under a newer ETag."""
+    def bar(view_fn):
+        @wraps(view_fn)
+        def foo(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            cached_view = cache_page(timeout, key_prefix=etag)(view_fn)
+            return condition(etag_func=lambda *a, **kw: etag)(cached_view)(request, *args, **kwargs)
+        return foo
+    return bar
+
+def _public_draw_round(request):
+    """Returns the round whose draw is shown by public_draw or
+    public_draw_by_round."""
+    if hasattr(request, 'round'):
+        return request.round
+    return request.tournament.current_round
+
+def public_draw_etag(request, *args, **kwargs):
+    """Changes whenever the round, the tournament's settings or anything shown
+    in a draw changes (see update_draw_version). It's built from a cache
+    counter and values already loaded for the request, so costs no queries."""
+    t = request.tournament
+    round = _public_draw_round(request)
+    fingerprint = [t.current_round_id, round.id, round.draw_status,
+            get_cache_version("draw_version"), sorted(t.config.as_dict().items())]
+    return hashlib.md5(repr(fingerprint)).hexdigest()
+
+def public_tab_etag(request, *args, **kwargs):
+    """Changes whenever anything the tabs show is saved or deleted (see
+    update_tab_version), any setting changes or the current round moves on."""
+    t = request.tournament
+    fingerprint = [t.current_round_id, get_cache_version(tab_version_key(t.id)),
+            sorted(t.config.as_dict().items())]
+    return hashlib.md5(repr(fingerprint)).hexdigest()
+
+# Debate columns used by the draw display pages; the rest of the row is deferred
+DRAW_DISPLAY_FIELDS = ('id', 'round', 'venue', 'division', 'result_status')
+
 def admin_required(view_fn):
     return user_passes_test(lambda u: u.is_superuser)(view_fn)
 
@@ -119,7 +196,6 @@ def index(request):
 @cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @tournament_view
 def team_speakers(request, t, team_id):
-    from django.http import JsonResponse
     team = Team.objects.get(pk=team_id)
     speakers = team.speakers
     data = {}
@@ -138,12 +214,16 @@ def public_index(request, t):
 @cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @public_optional_tournament_view('public_participants')
 def public_participants(request, t):
-    adjs = Adjudicator.objects.all()
-    speakers = Speaker.objects.all().select_related('team','team__institution')
+    adjs = Adjudicator.objects.values('name', 'institution__name', 'independent', 'adj_core')
+    # Speakers are plain dicts; only their teams (far fewer) are model instances
+    teams = dict((team.id, team) for team in Team.objects.select_related('institution'))
+    speakers = list(Speaker.objects.values('name', 'novice', 'team'))
+    for speaker in speakers:
+        speaker['team'] = teams[speaker['team']]
     return r2r(request, "public/public_participants.html", dict(adjs=adjs, speakers=speakers))
 
-@cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @public_optional_tournament_view('public_draw')
+@cache_page_with_etag(settings.PUBLIC_PAGE_CACHE_TIMEOUT, public_draw_etag)
 def public_draw(request, t):
     r = t.current_round
     if r.draw_status == r.STATUS_RELEASED:
@@ -152,8 +232,8 @@ def public_draw(request, t):
     else:
         return r2r(request, 'public/public_draw_unreleased.html', dict(draw=None, round=r))
 
-@cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @public_optional_round_view('show_all_draws')
+@cache_page_with_etag(settings.PUBLIC_PAGE_CACHE_TIMEOUT, public_draw_etag)
 def public_draw_by_round(request, round):
     if round.draw_status == round.STATUS_RELEASED:
         draw = round.get_draw()
@@ -179,8 +259,6 @@ def public_team_standings(request, t):
 
     if round is not None and round.silent is False:
 
-        from debate.models import TeamScore
-
         # Ranking by institution__name and reference isn't the same as ordering by
         # short_name, which is what we really want. But we can't rank by short_name,
         # because it's not a field (it's a property). So we'll do this in JavaScript.
@@ -189,24 +267,12 @@ def public_team_standings(request, t):
         # of wins.
         teams = Team.objects.order_by('institution__code', 'reference')
         rounds = t.prelim_rounds(until=round).filter(silent=False).order_by('seq')
-
-        def get_round_result(team, r):
-            try:
-                ts = TeamScore.objects.get(
-                    ballot_submission__confirmed=True,
-                    debate_team__team=team,
-                    debate_team__debate__round=r,
-                )
-                ts.opposition = ts.debate_team.opposition.team
-                return ts
-            except TeamScore.DoesNotExist:
-                return None
+        team_scores = confirmed_team_scores(rounds)
 
         for team in teams:
-            team.round_results = [get_round_result(team, r) for r in rounds]
+            team.round_results = [team_scores.get((team.id, r.id)) for r in rounds]
             # Do this manually, in case there are silent rounds
-            team.wins = [ts.win for ts in team.round_results if ts].count(True)
-            team.points = sum([ts.points for ts in team.round_results if ts])
+            set_wins_and_points(team)
 
 
         return r2r(request, 'public/public_team_standings.html', dict(teams=teams, rounds=rounds, round=round))
@@ -281,13 +347,15 @@ def update_breaking_teams(request, t, category):
 @cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @public_optional_tournament_view('public_breaking_adjs')
 def public_breaking_adjs(request, t):
-    adjs = Adjudicator.objects.filter(breaking=True, tournament=t)
+    adjs = Adjudicator.objects.filter(breaking=True, tournament=t).values('name',
+            'institution__name', 'independent', 'adj_core')
     return r2r(request, 'public/public_breaking_adjudicators.html', dict(adjs=adjs))
 
 @admin_required
 @tournament_view
 def breaking_adjs(request, t):
-    adjs = Adjudicator.objects.filter(breaking=True, tournament=t)
+    adjs = Adjudicator.objects.filter(breaking=True, tournament=t).values('name',
+            'institution__name', 'independent', 'adj_core')
     return r2r(request, 'breaking_adjudicators.html', dict(adjs=adjs))
 
 @admin_required
@@ -341,12 +409,16 @@ def public_feedback_progress(request, t):
 
     feedback = AdjudicatorFeedback.objects.all()
     adjudicators = Adjudicator.objects.all()
+    adjudications = list(DebateAdjudicator.objects.select_related('adjudicator','debate').all())
     teams = Team.objects.all()
     current_round = request.tournament.current_round.seq
 
+    # Count submissions for everyone at once, rather than once per adj/team
+    adj_counts = dict(feedback.values_list('source_adjudicator__adjudicator').annotate(Count('id')))
+    team_counts = dict(feedback.values_list('source_team__team').annotate(Count('id')))
+
     for adj in adjudicators:
         adj.total_ballots = 0
-        adj.submitted_feedbacks = feedback.filter(source_adjudicator__adjudicator = adj)
         adjs_adjudications = [a for a in adjudications if a.adjudicator == adj]
 
         for item in adjs_adjudications:
@@ -363,12 +435,12 @@ def public_feedback_progress(request, t):
                 # Trainees owe on chairs
                 adj.total_ballots += 1
 
-        adj.submitted_ballots = max(adj.submitted_feedbacks.count(), 0)
+        adj.submitted_ballots = adj_counts.get(adj.id, 0)
         adj.owed_ballots = max((adj.total_ballots - adj.submitted_ballots), 0)
         adj.coverage = min(calculate_coverage(adj.submitted_ballots, adj.total_ballots), 100)
 
     for team in teams:
-        team.submitted_ballots = max(feedback.filter(source_team__team = team).count(), 0)
+        team.submitted_ballots = team_counts.get(team.id, 0)
         team.owed_ballots = max((current_round - team.submitted_ballots), 0)
         team.coverage = min(calculate_coverage(team.submitted_ballots, current_round), 100)
 
@@ -384,11 +456,15 @@ def public_motions(request, t):
 @cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @public_optional_tournament_view('public_divisions')
 def public_divisions(request, t):
-    divisions = Division.objects.filter(tournament=t).all().select_related('venue_group')
-    divisions = sorted(divisions, key=lambda x: float(x.name))
-    venue_groups = set(d.venue_group for d in divisions)
-    for uvg in venue_groups:
-        uvg.divisions = [d for d in divisions if d.venue_group == uvg]
+    divisions = Division.objects.filter(tournament=t).select_related('venue_group').extra(
+        select={'name_num': 'CAST("debate_division"."name" AS FLOAT)'}).order_by(
+        'venue_group__id', 'name_num')
+    venue_groups = []
+    for venue_group, group_divisions in groupby(divisions, key=attrgetter('venue_group')):
+        if venue_group is None:
+            continue
+        venue_group.divisions = list(group_divisions)
+        venue_groups.append(venue_group)
 
     return r2r(request, 'public/public_divisions.html', dict(venue_groups=venue_groups))
 
@@ -402,15 +478,16 @@ def all_tournaments_all_venues(request, t):
 @tournament_view
 def all_draws_for_venue(request, t, venue_id):
     venue_group = VenueGroup.objects.get(pk=venue_id)
-    debates = Debate.objects.filter(division__venue_group=venue_group).select_related(
-        'round','round__tournament','division')
+    debates = Debate.objects.filter(division__venue_group=venue_group).only(
+        *DRAW_DISPLAY_FIELDS).select_related('round','round__tournament','division',
+        'division__venue_group','venue__group')
     return r2r(request, 'public/public_all_draws_for_venue.html', dict(
         venue_group=venue_group, debates=debates))
 
 @cache_page(settings.PUBLIC_PAGE_CACHE_TIMEOUT)
 @tournament_view
 def all_tournaments_all_institutions(request, t):
-    institutions = Institution.objects.all()
+    institutions = Institution.objects.values('id', 'name')
     return r2r(request, 'public/public_all_tournament_institutions.html', dict(
         institutions=institutions))
 
@@ -437,7 +514,7 @@ def all_tournaments_all_teams(request, t):
 def public_all_draws(request, t):
     all_rounds = list(Round.objects.filter(tournament=t))
     for r in all_rounds:
-        r.draw = r.get_draw()
+        r.draw = r.get_draw().only(*DRAW_DISPLAY_FIELDS).select_related('round', 'venue__group')
 
     return r2r(request, 'public/public_draw_display_all.html', dict(
         all_rounds=all_rounds))
@@ -447,55 +524,38 @@ def public_all_draws(request, t):
 def public_side_allocations(request, t):
     teams = Team.objects.filter(tournament=t)
     rounds = Round.objects.filter(tournament=t).order_by("seq")
+    round_seqs = [round.seq for round in rounds]
     tpas = dict()
     TPA_MAP = {
         TeamPositionAllocation.POSITION_AFFIRMATIVE: "Aff",
         TeamPositionAllocation.POSITION_NEGATIVE: "Neg",
     }
-    for tpa in TeamPositionAllocation.objects.all():
-        tpas[(tpa.team.id, tpa.round.seq)] = TPA_MAP[tpa.position]
+    tpa_rows = TeamPositionAllocation.objects.filter(round__tournament=t).values_list(
+        'team_id', 'round__seq', 'position')
+    for team_id, seq, position in tpa_rows:
+        tpas[(team_id, seq)] = TPA_MAP[position]
     for team in teams:
-        team.side_allocations = [tpas.get((team.id, round.seq), "-") for round in rounds]
+        team.side_allocations = [tpas.get((team.id, seq), "-") for seq in round_seqs]
     return r2r(request, "public/public_side_allocations.html", dict(teams=teams, rounds=rounds))
 
 ## Tab
 
-@cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @public_optional_tournament_view('tab_released')
+@cache_page_with_etag(settings.TAB_PAGES_CACHE_TIMEOUT, public_tab_etag)
 def public_team_tab(request, t):
     print "Generating public team tab"
     round = t.current_round
     teams = Team.objects.ranked_standings(round)
     rounds = t.prelim_rounds(until=round).order_by('seq')
-    team_scores = list(TeamScore.objects.select_related('debate_team__team', 'debate_team__debate__round').filter(ballot_submission__confirmed=True))
-
-    def get_round_result(team, r):
-        ts = next((x for x in team_scores if x.debate_team.team == team and x.debate_team.debate.round == r), None)
-        try:
-            ts.opposition = ts.debate_team.opposition.team # TODO: this slows down the page generation considerably
-        except AttributeError:
-            pass
-        except Exception as e:
-            print "Unexpected exception in view.team_standings.get_round_result"
-            print e
-        return ts
+    standings = TeamRoundStanding.objects.filter(team__tournament=t,
+            round__in=rounds).select_related('opposition', 'debate_team')
+    team_scores = dict(((ts.team_id, ts.round_id), ts) for ts in standings)
+    show_avg_margin = round.tournament.config.get('show_avg_margin')
 
     for team in teams:
         team.results_in = True # always
-        team.round_results = [get_round_result(team, r) for r in rounds]
-        team.wins = [ts.win for ts in team.round_results if ts].count(True)
-        team.points = sum([ts.points for ts in team.round_results if ts])
-        if round.tournament.config.get('show_avg_margin'):
-            try:
-                margins = []
-                for ts in team.round_results:
-                    if ts:
-                        if ts.get_margin is not None:
-                            margins.append(ts.get_margin)
-
-                team.avg_margin = sum(margins) / float(len(margins))
-            except ZeroDivisionError:
-                team.avg_margin = None
+        team.round_results = [team_scores.get((team.id, r.id)) for r in rounds]
+        set_wins_and_points(team, avg_margin=show_avg_margin)
 
     show_ballots = round.tournament.config.get('ballots_released')
     metrics = relevant_team_standings_metrics(round.tournament)
@@ -506,8 +566,8 @@ def public_team_tab(request, t):
 
 
 
-@cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @public_optional_tournament_view('motion_tab_released')
+@cache_page_with_etag(settings.TAB_PAGES_CACHE_TIMEOUT, public_tab_etag)
 def public_motions_tab(request, t):
     round = t.current_round
     rounds = t.prelim_rounds(until=round).order_by('seq')
@@ -578,7 +638,7 @@ def results_status_update(request, t):
 
     stats = [[0,stats_confirmed], [0,stats_draft], [0,stats_none]]
 
-    return HttpResponse(json.dumps(stats), content_type="text/json")
+    return JsonResponse(stats, safe=False)
 
 @login_required
 @tournament_view
@@ -602,7 +662,7 @@ def action_log_update(request, t):
         }
         action_objects.append(action)
 
-    return HttpResponse(json.dumps(action_objects), content_type="text/json")
+    return JsonResponse(action_objects, safe=False)
 
 
 
@@ -636,7 +696,7 @@ def feedback_progress(request, t):
             return int((float(submitted) / float(total)) * 100)
 
     from debate.models import AdjudicatorFeedback
-    feedback = AdjudicatorFeedback.objects.select_related('source_adjudicator__adjudicator','source_team__team').all()
+    feedback = AdjudicatorFeedback.objects.all()
     adjudicators = Adjudicator.objects.all()
     adjudications = list(DebateAdjudicator.objects.select_related('adjudicator','debate').all())
     teams = Team.objects.all()
@@ -645,9 +705,12 @@ def feedback_progress(request, t):
     rounds_owed = request.tournament.rounds.filter(silent=False,
         draw_status=request.tournament.current_round.STATUS_RELEASED).count()
 
+    # Count submissions for everyone at once, rather than once per adj/team
+    adj_counts = dict(feedback.values_list('source_adjudicator__adjudicator').annotate(Count('id')))
+    team_counts = dict(feedback.values_list('source_team__team').annotate(Count('id')))
+
     for adj in adjudicators:
         adj.total_ballots = 0
-        adj.submitted_feedbacks = feedback.filter(source_adjudicator__adjudicator = adj)
         adjs_adjudications = [a for a in adjudications if a.adjudicator == adj]
 
         for item in adjs_adjudications:
@@ -664,12 +727,12 @@ def feedback_progress(request, t):
                 # Trainees owe on chairs
                 adj.total_ballots += 1
 
-        adj.submitted_ballots = max(adj.submitted_feedbacks.count(), 0)
+        adj.submitted_ballots = adj_counts.get(adj.id, 0)
         adj.owed_ballots = max((adj.total_ballots - adj.submitted_ballots), 0)
         adj.coverage = min(calculate_coverage(adj.submitted_ballots, adj.total_ballots), 100)
 
     for team in teams:
-        team.submitted_ballots = max(feedback.filter(source_team__team = team).count(), 0)
+        team.submitted_ballots = team_counts.get(team.id, 0)
         team.owed_ballots = max((rounds_owed - team.submitted_ballots), 0)
         team.coverage = min(calculate_coverage(team.submitted_ballots, rounds_owed), 100)
 
@@ -712,9 +775,9 @@ def checkin(request, round):
         v = request.POST.get('barcode_id')
         try:
             barcode_id = int(v)
-            p = Person.objects.get(barcode_id=barcode_id)
+            p = Person.objects.get_checkin_details(barcode_id)
             ch, created = Checkin.objects.get_or_create(
-                person = p,
+                person_id = p['id'],
                 round = round
             )
             context['person'] = p
@@ -731,16 +794,16 @@ def post_checkin(request, round):
     v = request.POST.get('barcode_id')
     try:
         barcode_id = int(v)
-        p = Person.objects.get(barcode_id=barcode_id)
+        p = Person.objects.get_checkin_details(barcode_id)
         ch, created = Checkin.objects.get_or_create(
-            person = p,
+            person_id = p['id'],
             round = round
         )
 
-        message = p.checkin_message
+        message = p['checkin_message']
 
         if not message:
-            message = "Checked in %s" % p.name
+            message = "Checked in %s" % p['name']
         return HttpResponse(message)
 
     except (ValueError, Person.DoesNotExist):
@@ -769,11 +832,9 @@ def checkin_results(request, round, model, context_name):
 def _update_availability(request, round, update_method, active_model, active_attr):
 
     if request.POST.get('copy'):
-        prev_round = Round.objects.get(tournament=round.tournament,
-                                       seq=round.seq-1)
-
-        prev_objects = active_model.objects.filter(round=prev_round)
-        available_ids = [getattr(o, '%s_id' % active_attr) for o in prev_objects]
+        available_ids = list(active_model.objects.filter(
+                round__tournament=round.tournament, round__seq=round.seq-1,
+            ).values_list('%s_id' % active_attr, flat=True))
         getattr(round, update_method)(available_ids)
 
         return HttpResponseRedirect(request.path.replace('update/', ''))
@@ -809,13 +870,15 @@ def checkin_update(request, round, update_method, active_model, active_attr):
 @admin_required
 @round_view
 def draw_display_by_venue(request, round):
-    draw = round.get_draw()
+    draw = round.get_draw().only(*DRAW_DISPLAY_FIELDS).select_related('venue__group')
+    draw = populate_adjudicators(list(draw))
     return r2r(request, "draw_display_by_venue.html", dict(round=round, draw=draw))
 
 @admin_required
 @round_view
 def draw_display_by_team(request, round):
-    draw = round.get_draw()
+    draw = round.get_draw().only(*DRAW_DISPLAY_FIELDS).select_related('venue__group')
+    draw = populate_adjudicators(list(draw))
     return r2r(request, "draw_display_by_team.html", dict(draw=draw))
 
 @login_required
@@ -869,6 +932,8 @@ def draw_draft(request, round):
 
 
 def draw_confirmed(request, round):
+    # Also used by round.adjudicators_allocation_validity
+    round.get_cached_draw = populate_adjudicators(list(round.get_draw()))
     draw = round.get_cached_draw
     rooms = float(round.active_teams.count()) / 2
     active_adjs = round.active_adjudicators.all()
@@ -883,7 +948,7 @@ def draw_confirmed(request, round):
 @admin_required
 @round_view
 def draw_print_scoresheets(request, round):
-    draw = round.get_draw_by_room()
+    draw = populate_adjudicators(list(round.get_draw_by_room()))
     config = round.tournament.config
     motions = Motion.objects.filter(round=round)
     return r2r(request, "printable_scoresheets.html", dict(
@@ -893,7 +958,7 @@ def draw_print_scoresheets(request, round):
 @admin_required
 @round_view
 def draw_print_feedback(request, round):
-    draw = round.get_draw_by_room()
+    draw = populate_adjudicators(list(round.get_draw_by_room()))
     config = round.tournament.config
     questions = round.tournament.adj_feedback_questions
     for question in questions:
@@ -985,17 +1050,20 @@ def unrelease_draw(request, round):
 def side_allocations(request, t):
     teams = Team.objects.filter(tournament=t)
     rounds = Round.objects.filter(tournament=t).order_by("seq")
+    round_seqs = [round.seq for round in rounds]
     tpas = dict()
     TPA_MAP = {
         TeamPositionAllocation.POSITION_AFFIRMATIVE: "Aff",
         TeamPositionAllocation.POSITION_NEGATIVE: "Neg",
         None: "-"
     }
-    for tpa in TeamPositionAllocation.objects.all():
-        tpas[(tpa.team.id, tpa.round.seq)] = TPA_MAP[tpa.position]
+    tpa_rows = TeamPositionAllocation.objects.filter(round__tournament=t).values_list(
+        'team_id', 'round__seq', 'position')
+    for team_id, seq, position in tpa_rows:
+        tpas[(team_id, seq)] = TPA_MAP[position]
 
     for team in teams:
-        team.side_allocations = [tpas.get((team.id, round.seq), "-") for round in rounds]
+        team.side_allocations = [tpas.get((team.id, seq), "-") for seq in round_seqs]
 
     return r2r(request, "side_allocations.html", dict(teams=teams, rounds=rounds))
 
@@ -1004,8 +1072,8 @@ def side_allocations(request, t):
 @tournament_view
 def division_allocations(request, t):
     teams = Team.objects.filter(tournament=t).all()
-    divisions = Division.objects.filter(tournament=t).all()
-    divisions = sorted(divisions, key=lambda x: float(x.name))
+    divisions = Division.objects.filter(tournament=t).extra(
+        select={'name_num': 'CAST("debate_division"."name" AS FLOAT)'}).order_by('name_num')
     venue_groups = VenueGroup.objects.all()
 
     return r2r(request, "division_allocations.html", dict(teams=teams, divisions=divisions, venue_groups=venue_groups))
@@ -1017,12 +1085,15 @@ def division_allocations(request, t):
 def save_divisions(request, t):
     culled_dict = dict((int(k), int(v)) for k, v in request.POST.iteritems() if v)
 
-    teams = Team.objects.in_bulk([t_id for t_id in culled_dict.keys()])
-    divisions = Division.objects.in_bulk([d_id for d_id in culled_dict.values()])
+    divisions = set(Division.objects.filter(tournament=t,
+        id__in=culled_dict.values()).values_list('id', flat=True))
+    culled_dict = dict((k, v) for k, v in culled_dict.iteritems() if v in divisions)
 
-    for team_id, division_id in culled_dict.iteritems():
-        teams[team_id].division = divisions[division_id]
-        teams[team_id].save()
+    # One UPDATE for all teams, rather than a save() per team
+    if culled_dict:
+        Team.objects.filter(tournament=t, id__in=culled_dict.keys()).update(division=Case(
+            *[When(id=team_id, then=Value(division_id)) for team_id, division_id in culled_dict.iteritems()],
+            output_field=IntegerField()))
 
     # ActionLog.objects.log(type=ActionLog.ACTION_TYPE_DIVISIONS_SAVE,
     #     user=request.user, tournament=t)
@@ -1035,9 +1106,11 @@ def save_divisions(request, t):
 def create_division_allocation(request, t):
     from debate.division_allocator import DivisionAllocator
 
-    teams = list(Team.objects.filter(tournament=t))
+    teams = list(Team.objects.filter(tournament=t).prefetch_related(
+        Prefetch('teamvenuepreference_set',
+                 queryset=TeamVenuePreference.objects.select_related('venue_group'))))
     for team in teams:
-        preferences = list(TeamVenuePreference.objects.filter(team=team))
+        preferences = team.teamvenuepreference_set.all()
         team.preferences_dict = dict((p.priority, p.venue_group) for p in preferences)
 
     # Delete all existing divisions - this shouldn't affect teams (on_delete=models.SET_NULL))
@@ -1094,10 +1167,7 @@ def motion_standings(request, round, for_print=False):
 @admin_required
 @round_view
 def motions(request, round):
-    motions = list()
-    motions = Motion.objects.statistics(round=round)
-    if len(motions) > 0:
-        motions = [m for m in motions if m.round == round]
+    motions = Motion.objects.statistics(round=round, only_round=True)
 
     return r2r(request, "motions.html", dict(motions=motions))
 
@@ -1136,15 +1206,16 @@ def motions_assign(request, round):
 
     class MyModelChoiceField(ModelMultipleChoiceField):
         def label_from_instance(self, obj):
+            venue_group_parts = obj.venue_group.short_name.split(' ')
             return "%s %s - Division %s @ %s" % (
-                obj.venue_group.short_name.split(' ')[2],
-                obj.venue_group.short_name.split(' ')[1],
+                venue_group_parts[2],
+                venue_group_parts[1],
                 obj.name,
-                obj.venue_group.short_name.split(' ')[0],
+                venue_group_parts[0],
             )
 
     class ModelAssignForm(ModelForm):
-        divisions = MyModelChoiceField(widget=CheckboxSelectMultiple, queryset=Division.objects.filter(tournament=round.tournament).order_by('venue_group'))
+        divisions = MyModelChoiceField(widget=CheckboxSelectMultiple, queryset=Division.objects.filter(tournament=round.tournament).order_by('venue_group').select_related('venue_group'))
         class Meta:
             model = Motion
             fields = ("divisions",)
@@ -1214,11 +1285,6 @@ def set_adj_test_score(request, t):
     except ValueError:
         return HttpResponseBadRequest("Score value is not legit")
 
-    try:
-        adjudicator = Adjudicator.objects.get(id=adj_id)
-    except (Adjudicator.DoesNotExist, Adjudicator.MultipleObjectsReturned):
-        return HttpResponseBadRequest("Adjudicator probably doesn't exist")
-
     # CONTINUE HERE CONTINUE HERE WORK IN PROGRESS
     score_text = request.POST["test_score"]
     try:
@@ -1227,10 +1293,11 @@ def set_adj_test_score(request, t):
         print e
         return redirect_tournament('adj_feedback', t)
 
-    adjudicator.test_score = score
-    adjudicator.save()
+    # Update just the one column, rather than loading and saving the whole row
+    if not Adjudicator.objects.filter(id=adj_id).update(test_score=score):
+        return HttpResponseBadRequest("Adjudicator probably doesn't exist")
 
-    atsh = AdjudicatorTestScoreHistory(adjudicator=adjudicator,
+    atsh = AdjudicatorTestScoreHistory(adjudicator_id=adj_id,
         round=t.current_round, score=score)
     atsh.save()
     ActionLog.objects.log(type=ActionLog.ACTION_TYPE_TEST_SCORE_EDIT,
@@ -1245,17 +1312,9 @@ def set_adj_breaking_status(request, t):
     adj_id = int(request.POST["adj_id"])
     adj_breaking_status = str(request.POST["adj_breaking_status"])
 
-    try:
-        adjudicator = Adjudicator.objects.get(id=adj_id)
-    except (Adjudicator.DoesNotExist, Adjudicator.MultipleObjectsReturned):
+    if not Adjudicator.objects.filter(id=adj_id).update(breaking=(adj_breaking_status == "true")):
         return HttpResponseBadRequest("Adjudicator probably doesn't exist")
 
-    if adj_breaking_status == "true":
-        adjudicator.breaking = True
-    else:
-        adjudicator.breaking = False
-
-    adjudicator.save()
     return HttpResponse("ok")
 
 @admin_required
@@ -1268,11 +1327,6 @@ def set_adj_note(request, t):
     except ValueError:
         return HttpResponseBadRequest("Note value is not legit")
 
-    try:
-        adjudicator = Adjudicator.objects.get(id=adj_id)
-    except (Adjudicator.DoesNotExist, Adjudicator.MultipleObjectsReturned):
-        return HttpResponseBadRequest("Adjudicator probably doesn't exist")
-
     # CONTINUE HERE CONTINUE HERE WORK IN PROGRESS
     note_text = request.POST["note"]
     try:
@@ -1281,8 +1335,8 @@ def set_adj_note(request, t):
         print e
         return redirect_tournament('adj_feedback', t)
 
-    adjudicator.notes = note
-    adjudicator.save()
+    if not Adjudicator.objects.filter(id=adj_id).update(notes=note):
+        return HttpResponseBadRequest("Adjudicator probably doesn't exist")
 
     return redirect_tournament('adj_feedback', t)
 
@@ -1291,13 +1345,18 @@ def set_adj_note(request, t):
 def results(request, round):
 
     draw = round.get_draw()
-    stats = {
-        'none': draw.filter(result_status=Debate.STATUS_NONE, ballot_in=False).count(),
-        'ballot_in': draw.filter(result_status=Debate.STATUS_NONE, ballot_in=True).count(),
-        'draft': draw.filter(result_status=Debate.STATUS_DRAFT).count(),
-        'confirmed': draw.filter(result_status=Debate.STATUS_CONFIRMED).count(),
-        'postponed': draw.filter(result_status=Debate.STATUS_POSTPONED).count(),
-    }
+
+    def count_where(**conditions):
+        return Sum(Case(When(then=1, **conditions), default=0, output_field=IntegerField()))
+    # Aliases are prefixed so they don't clash with the ballot_in field
+    stats = draw.aggregate(
+        n_none=count_where(result_status=Debate.STATUS_NONE, ballot_in=False),
+        n_ballot_in=count_where(result_status=Debate.STATUS_NONE, ballot_in=True),
+        n_draft=count_where(result_status=Debate.STATUS_DRAFT),
+        n_confirmed=count_where(result_status=Debate.STATUS_CONFIRMED),
+        n_postponed=count_where(result_status=Debate.STATUS_POSTPONED),
+    )
+    stats = dict((key[2:], value or 0) for key, value in stats.iteritems()) # Sum() of no rows is None
 
     if not request.user.is_superuser:
         if round != request.tournament.current_round:
@@ -1308,10 +1367,10 @@ def results(request, round):
     else:
         template = "results.html"
 
-    num_motions = Motion.objects.filter(round=round).count()
-    show_motions_column = num_motions > 1
-    has_motions = num_motions > 0
+    show_motions_column = round.motion_count > 1
+    has_motions = round.motion_count > 0
 
+    draw = populate_adjudicators(list(draw))
     return r2r(request, template, dict(draw=draw, stats=stats,
         show_motions_column=show_motions_column, has_motions=has_motions)
     )
@@ -1323,8 +1382,8 @@ def public_results(request, round):
     if (round.seq >= round.tournament.current_round.seq and not round.tournament.release_all) or round.silent:
         print "Result page denied: round %d, current round %d, release all %s, silent %s" % (round.seq, round.tournament.current_round.seq, round.tournament.release_all, round.silent)
         raise Http404()
-    draw = round.get_draw()
-    show_motions_column = Motion.objects.filter(round=round).count() > 1 and round.tournament.config.get('show_motions_in_results')
+    draw = populate_adjudicators(list(round.get_draw()))
+    show_motions_column = round.motion_count > 1 and round.tournament.config.get('show_motions_in_results')
     show_splits = round.tournament.config.get('show_splitting_adjudicators')
     show_ballots = round.tournament.config.get('ballots_released')
     return r2r(request, "public/public_results_for_round.html", dict(
@@ -1387,7 +1446,7 @@ def edit_ballotset(request, t, ballotsub_id):
         'all_ballotsubs'   : all_ballotsubs,
         'disable_confirm'  : request.user == ballotsub.submitter and not t.config.get('enable_assistant_confirms') and not request.user.is_superuser,
         'round'            : debate.round,
-        'not_singleton'    : all_ballotsubs.exclude(id=ballotsub_id).exists(),
+        'not_singleton'    : any(b.id != ballotsub.id for b in all_ballotsubs),
         'new'              : False,
         'show_adj_contact' : True,
     }
@@ -1473,7 +1532,7 @@ def new_ballotset(request, t, debate_id):
         'debate'           : debate,
         'round'            : debate.round,
         'all_ballotsubs'   : all_ballotsubs,
-        'not_singleton'    : all_ballotsubs.exists(),
+        'not_singleton'    : bool(all_ballotsubs), # also fills the queryset's cache for the template
         'new'              : True,
         'show_adj_contact' : True,
     }
@@ -1497,6 +1556,20 @@ def toggle_postponed(request, t):
 
 
 def get_speaker_standings(rounds, round, results_override=False, only_novices=False, for_replies=False):
+    """Returns ranked speakers for the given rounds, which are assumed to be
+    the preliminary rounds up to and including round. Results are cached per
+    round until a ballot, speaker, team or setting in the tournament changes."""
+    if results_override:
+        return _calculate_speaker_standings(rounds, round, results_override, only_novices, for_replies)
+
+    cached_key = speaker_standings_cache_key(round.id, only_novices, for_replies)
+    speakers = cache.get(cached_key)
+    if speakers is None:
+        speakers = _calculate_speaker_standings(rounds, round, results_override, only_novices, for_replies)
+        cache.set(cached_key, speakers, settings.STANDINGS_CACHE_TIMEOUT)
+    return speakers
+
+def _calculate_speaker_standings(rounds, round, results_override, only_novices, for_replies):
     last_substantive_position = round.tournament.LAST_SUBSTANTIVE_POSITION
     reply_position = round.tournament.REPLY_POSITION
     total_prelim_rounds = Round.objects.filter(stage=Round.STAGE_PRELIMINARY, tournament=round.tournament).count()
@@ -1504,13 +1577,13 @@ def get_speaker_standings(rounds, round, results_override=False, only_novices=Fa
     minimum_debates_needed = total_prelim_rounds - missable_debates
 
     if for_replies:
-        speaker_scores = SpeakerScore.objects.select_related(
-            'speaker','ballot_submission', 'debate_team__debate__round'
-            ).filter(ballot_submission__confirmed=True, position=reply_position)
+        speaker_scores = SpeakerScore.objects.filter(ballot_submission__confirmed=True,
+            position=reply_position)
     else:
-        speaker_scores = SpeakerScore.objects.select_related(
-            'speaker','ballot_submission', 'debate_team__debate__round'
-            ).filter(ballot_submission__confirmed=True, position__lte=last_substantive_position)
+        speaker_scores = SpeakerScore.objects.filter(ballot_submission__confirmed=True,
+            position__lte=last_substantive_position)
+    speaker_scores = speaker_scores.filter(debate_team__debate__round__in=rounds).values_list(
+        'speaker_id', 'debate_team__debate__round_id', 'score')
 
     if only_novices is True:
         speakers = list(Speaker.objects.filter(team__tournament=round.tournament, novice=True).select_related(
@@ -1519,32 +1592,26 @@ def get_speaker_standings(rounds, round, results_override=False, only_novices=Fa
         speakers = list(Speaker.objects.filter(team__tournament=round.tournament).select_related(
             'team', 'team__institution', 'team__tournament'))
 
-    def get_scores(speaker, this_speakers_scores):
-        speaker_scores = [None] * len(rounds)
-        for r in rounds:
-            finding_score = next((x for x in this_speakers_scores if x.debate_team.debate.round == r), None)
-            if finding_score:
-                speaker_scores[r.seq - 1] = finding_score.score
-
-        return speaker_scores
+    # Index scores once, rather than scanning every score for every speaker
+    scores_by_speaker_round = dict()
+    for speaker_id, round_id, score in speaker_scores:
+        scores_by_speaker_round.setdefault((speaker_id, round_id), score)
 
     for speaker in speakers:
-        this_speakers_scores = [score for score in speaker_scores if score.speaker == speaker]
-        speaker.scores = get_scores(speaker, this_speakers_scores)
+        speaker.scores = [scores_by_speaker_round.get((speaker.id, r.id)) for r in rounds]
         speaker.results_in = speaker.scores[-1] is not None or round.stage != Round.STAGE_PRELIMINARY or results_override
+        present = filter(None, speaker.scores)
+        debates_counted = len(present)
 
-        if round.seq < total_prelim_rounds or len(filter(None, speaker.scores)) >= minimum_debates_needed:
-            speaker.total = sum(filter(None, speaker.scores))
-            try:
-                speaker.average = sum(filter(None, speaker.scores)) / len(filter(None, speaker.scores))
-            except ZeroDivisionError:
-                speaker.average = None
+        if round.seq < total_prelim_rounds or debates_counted >= minimum_debates_needed:
+            speaker.total = sum(present)
+            speaker.average = speaker.total / debates_counted if debates_counted else None
         else:
             speaker.total = None
             speaker.average = None
 
         if for_replies:
-            speaker.replies_given = len(filter(None, speaker.scores))
+            speaker.replies_given = debates_counted
 
     if for_replies:
         speakers = [s for s in speakers if s.replies_given > 0]
@@ -1553,18 +1620,13 @@ def get_speaker_standings(rounds, round, results_override=False, only_novices=Fa
     current_rank = 0
 
     if for_replies or round.tournament.config.get('standings_method') is False:
-        method = False
-        speakers.sort(key=lambda x: x.average, reverse=True)
+        rank_key = attrgetter('average')
     else:
-        method = True
-        speakers.sort(key=lambda x: x.total, reverse=True)
+        rank_key = attrgetter('total')
+    speakers.sort(key=rank_key, reverse=True)
 
     for i, speaker in enumerate(speakers, start=1):
-        if method:
-            comparison = speaker.total
-        else:
-            comparison = speaker.average
-
+        comparison = rank_key(speaker)
         if comparison != prev_total:
             current_rank = i
             prev_total = comparison
@@ -1578,35 +1640,13 @@ def get_speaker_standings(rounds, round, results_override=False, only_novices=Fa
 def team_standings(request, round, for_print=False):
     teams = Team.objects.ranked_standings(round)
     rounds = round.tournament.prelim_rounds(until=round).order_by('seq')
-    team_scores = list(TeamScore.objects.select_related('debate_team__team', 'debate_team__debate__round').filter(ballot_submission__confirmed=True))
-
-    def get_round_result(team, r):
-        ts = next((x for x in team_scores if x.debate_team.team == team and x.debate_team.debate.round == r), None)
-        try:
-            ts.opposition = ts.debate_team.opposition.team # TODO: this slows down the page generation considerably
-        except AttributeError:
-            pass
-        except Exception as e:
-            print "Unexpected exception in view.team_standings.get_round_result"
-            print e
-        return ts
+    team_scores = confirmed_team_scores(rounds)
+    show_avg_margin = round.tournament.config.get('show_avg_margin')
 
     for team in teams:
-        team.results_in = round.stage != Round.STAGE_PRELIMINARY or get_round_result(team, round) is not None
-        team.round_results = [get_round_result(team, r) for r in rounds]
-        team.wins = [ts.win for ts in team.round_results if ts].count(True)
-        team.points = sum([ts.points for ts in team.round_results if ts])
-        if round.tournament.config.get('show_avg_margin'):
-            try:
-                margins = []
-                for ts in team.round_results:
-                    if ts:
-                        if ts.get_margin is not None:
-                            margins.append(ts.get_margin)
-
-                team.avg_margin = sum(margins) / float(len(margins))
-            except ZeroDivisionError:
-                team.avg_margin = None
+        team.results_in = round.stage != Round.STAGE_PRELIMINARY or (team.id, round.id) in team_scores
+        team.round_results = [team_scores.get((team.id, r.id)) for r in rounds]
+        set_wins_and_points(team, avg_margin=show_avg_margin)
 
     metrics = relevant_team_standings_metrics(round.tournament)
 
@@ -1632,21 +1672,10 @@ def division_standings(request, round, for_print=False):
         except TeamScore.DoesNotExist:
             return None
 
+    show_avg_margin = round.tournament.config.get('show_avg_margin')
     for team in teams:
         team.round_results = [get_round_result(team, r) for r in rounds]
-        team.wins = [ts.win for ts in team.round_results if ts].count(True)
-        team.points = sum([ts.points for ts in team.round_results if ts])
-        if round.tournament.config.get('show_avg_margin'):
-            try:
-                margins = []
-                for ts in team.round_results:
-                    if ts:
-                        if ts.get_margin is not None:
-                            margins.append(ts.get_margin)
-
-                team.avg_margin = sum(margins) / float(len(margins))
-            except ZeroDivisionError:
-                team.avg_margin = None
+        set_wins_and_points(team, avg_margin=show_avg_margin)
 
 
     return r2r(request, 'division_standings.html', dict(teams=teams))
@@ -1659,8 +1688,8 @@ def speaker_standings(request, round, for_print=False):
     return r2r(request, "speaker_standings.html", dict(speakers=speakers,
                                         rounds=rounds, for_print=for_print))
 
-@cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @public_optional_tournament_view('tab_released')
+@cache_page_with_etag(settings.TAB_PAGES_CACHE_TIMEOUT, public_tab_etag)
 def public_speaker_tab(request, t):
     print "Generating public speaker tab"
     round = t.current_round
@@ -1678,8 +1707,8 @@ def novice_standings(request, round, for_print=False):
                                         rounds=rounds))
 
 
-@cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @public_optional_tournament_view('tab_released')
+@cache_page_with_etag(settings.TAB_PAGES_CACHE_TIMEOUT, public_tab_etag)
 def public_novices_tab(request, t):
     round = t.current_round
     rounds = round.tournament.prelim_rounds(until=round).order_by('seq')
@@ -1695,8 +1724,8 @@ def reply_standings(request, round, for_print=False):
     return r2r(request, 'reply_standings.html', dict(speakers=speakers,
                                         rounds=rounds, for_print=for_print))
 
-@cache_page(settings.TAB_PAGES_CACHE_TIMEOUT)
 @public_optional_tournament_view('tab_released')
+@cache_page_with_etag(settings.TAB_PAGES_CACHE_TIMEOUT, public_tab_etag)
 def public_replies_tab(request, t):
     round = t.current_round
     rounds = t.prelim_rounds(until=round).order_by('seq')
@@ -1723,41 +1752,43 @@ def save_matchups(request, round):
     #print request.POST.keys()
 
     existing_debate_ids = [int(a.replace('debate_', '')) for a in request.POST.keys() if a.startswith('debate_')]
-    for debate_id in existing_debate_ids:
-        debate = Debate.objects.get(id=debate_id)
+    new_debate_ids = [int(a.replace('new_debate_', '')) for a in request.POST.keys() if a.startswith('new_debate_')]
+
+    def posted_team_ids(debate_id):
         new_aff_id = request.POST.get('aff_%s' % debate_id).replace('team_', '')
         new_neg_id = request.POST.get('neg_%s' % debate_id).replace('team_', '')
-
         if new_aff_id and new_neg_id:
-            DebateTeam.objects.filter(debate=debate).delete()
-            debate.save()
+            return int(new_aff_id), int(new_neg_id)
+        return None
 
-            new_aff_team = Team.objects.get(id=int(new_aff_id))
-            new_aff_dt = DebateTeam(debate=debate, team=new_aff_team, position=DebateTeam.POSITION_AFFIRMATIVE)
-            new_aff_dt.save()
+    new_debate_teams = []
+    def add_debate_teams(aff_id, neg_id, **debate):
+        new_debate_teams.append(DebateTeam(team_id=aff_id, position=DebateTeam.POSITION_AFFIRMATIVE, **debate))
+        new_debate_teams.append(DebateTeam(team_id=neg_id, position=DebateTeam.POSITION_NEGATIVE, **debate))
 
-            new_aff_team = Team.objects.get(id=int(new_neg_id))
-            new_neg_dt = DebateTeam(debate=debate, team=new_aff_team, position=DebateTeam.POSITION_NEGATIVE)
-            new_neg_dt.save()
+    blank_debate_ids = []
+    for debate_id in existing_debate_ids:
+        team_ids = posted_team_ids(debate_id)
+        if team_ids:
+            add_debate_teams(*team_ids, debate_id=debate_id)
         else:
             # If there's blank debates we need to delete those
-            debate.delete()
+            blank_debate_ids.append(debate_id)
 
-    new_debate_ids = [int(a.replace('new_debate_', '')) for a in request.POST.keys() if a.startswith('new_debate_')]
-    for debate_id in new_debate_ids:
-        new_aff_id = request.POST.get('aff_%s' % debate_id).replace('team_', '')
-        new_neg_id = request.POST.get('neg_%s' % debate_id).replace('team_', '')
+    # Clear out the old teams in one go; the new ones are all created together below
+    DebateTeam.objects.filter(debate__round=round, debate_id__in=existing_debate_ids).delete()
+    Debate.objects.filter(round=round, id__in=blank_debate_ids).delete()
 
-        if new_aff_id and new_neg_id:
+    for debate_id in new_debate_ids:
+        team_ids = posted_team_ids(debate_id)
+        if team_ids:
             debate = Debate(round=round, venue=None)
             debate.save()
+            add_debate_teams(*team_ids, debate=debate)
 
-            aff_team = Team.objects.get(id=int(new_aff_id))
-            neg_team = Team.objects.get(id=int(new_neg_id))
-            new_aff_dt = DebateTeam(debate=debate, team=aff_team, position=DebateTeam.POSITION_AFFIRMATIVE)
-            new_neg_dt = DebateTeam(debate=debate, team=neg_team, position=DebateTeam.POSITION_NEGATIVE)
-            new_aff_dt.save()
-            new_neg_dt.save()
+    DebateTeam.objects.bulk_create(new_debate_teams)
+    adj_history_changed()
+    update_draw_version()
 
     return HttpResponse("ok")
 
@@ -1782,15 +1813,12 @@ def save_venues(request, round):
     data = [(int(a.split('_')[1]), v_id(a))
              for a in request.POST.keys()]
 
-    debates = Debate.objects.in_bulk([d_id for d_id, _ in data])
-    venues = Venue.objects.in_bulk([v_id for _, v_id in data])
-    for debate_id, venue_id in data:
-        if venue_id == None:
-            debates[debate_id].venue = None
-        else:
-            debates[debate_id].venue = venues[venue_id]
-
-        debates[debate_id].save()
+    # One UPDATE for the whole draw, rather than a save() per debate
+    if data:
+        Debate.objects.filter(round=round, id__in=[d_id for d_id, _ in data]).update(venue=Case(
+            *[When(id=debate_id, then=Value(venue_id)) for debate_id, venue_id in data],
+            output_field=IntegerField()))
+        update_draw_version() # update() doesn't send post_save
 
     ActionLog.objects.log(type=ActionLog.ACTION_TYPE_VENUES_SAVE,
         user=request.user, round=round, tournament=round.tournament)
@@ -1803,31 +1831,31 @@ def save_venues(request, round):
 def draw_adjudicators_edit(request, round):
     context = dict()
     context['draw'] = draw = round.get_draw()
-    context['adj0'] = Adjudicator.objects.first()
+    context['adj0'] = Adjudicator.objects.values('id').first()
     context['duplicate_adjs'] = round.tournament.config.get('duplicate_adjs')
     context['feedback_headings'] = [q.name for q in round.tournament.adj_feedback_questions]
 
+    # Count every team's adjudicators in earlier rounds in one query, rather
+    # than two counts per team
+    team_ids = set()
+    for debate in draw:
+        team_ids.update([debate.aff_team.id, debate.neg_team.id])
+    prior_adj_counts = DebateAdjudicator.objects.filter(debate__round__seq__lt=round.seq,
+        debate__debateteam__team_id__in=team_ids).order_by().values_list(
+        'debate__debateteam__team_id').annotate(n_adjs=Count('id')).annotate(n_male_adjs=Sum(Case(
+            When(adjudicator__gender="M", then=1), default=0, output_field=IntegerField())))
+    prior_adj_counts = dict((team_id, (adjs, male_adjs)) for team_id, adjs, male_adjs in prior_adj_counts)
+
     def calculate_prior_adj_genders(team):
-        debates = team.get_debates(round.seq)
-        adjs = DebateAdjudicator.objects.filter(debate__in=debates).count()
-        male_adjs = DebateAdjudicator.objects.filter(debate__in=debates,adjudicator__gender="M").count()
-        if male_adjs > 0:
-            male_adj_percent = int((float(male_adjs) / float(adjs)) * 100)
-            return male_adj_percent
-        else:
+        adjs, male_adjs = prior_adj_counts.get(team.id, (0, 0))
+        if not adjs:
             return 0
+        return male_adjs * 100 // adjs
 
     for debate in draw:
-        aff_male_adj_percent = calculate_prior_adj_genders(debate.aff_team)
-        debate.aff_team.male_adj_percent = aff_male_adj_percent
-
-        neg_male_adj_percent = calculate_prior_adj_genders(debate.neg_team)
-        debate.neg_team.male_adj_percent = neg_male_adj_percent
-
-        if neg_male_adj_percent > aff_male_adj_percent:
-            debate.gender_class = (neg_male_adj_percent / 5) - 10
-        else:
-            debate.gender_class = (aff_male_adj_percent / 5) - 10
+        debate.aff_team.male_adj_percent = calculate_prior_adj_genders(debate.aff_team)
+        debate.neg_team.male_adj_percent = calculate_prior_adj_genders(debate.neg_team)
+        debate.gender_class = max(debate.aff_team.male_adj_percent, debate.neg_team.male_adj_percent) / 5 - 10
 
     regions = round.tournament.region_set.order_by('name')
     break_categories = round.tournament.breakcategory_set.order_by('seq').exclude(is_general=True)
@@ -1837,37 +1865,40 @@ def draw_adjudicators_edit(request, round):
 
     return r2r(request, "draw_adjudicators_edit.html", context)
 
-def _json_adj_allocation(debates, unused_adj):
+def _json_adj(a):
+    if a.institution.region_id:
+        region_name = "region-%s" % a.institution.region_id
+    else:
+        region_name = ""
+
+    return {
+        'id': a.id,
+        'name': a.name + " (" + a.institution.short_code + ")",
+        'is_unaccredited': a.is_unaccredited,
+        'gender': a.gender,
+        'region': region_name
+    }
 
-    obj = {}
+def _json_debate(d):
+    r = {}
+    adjudicators = d.adjudicators
+    if adjudicators.chair:
+        r['chair'] = _json_adj(adjudicators.chair)
+    r['panel'] = [_json_adj(a) for a in adjudicators.panel]
+    r['trainees'] = [_json_adj(a) for a in adjudicators.trainees]
+    return r
 
-    def _adj(a):
+def _json_adj_allocation(debates, unused_adj):
 
-        if a.institution.region:
-            region_name = "region-%s" % a.institution.region.id
-        else:
-            region_name = ""
-
-        return {
-            'id': a.id,
-            'name': a.name + " (" + a.institution.short_code + ")",
-            'is_unaccredited': a.is_unaccredited,
-            'gender': a.gender,
-            'region': region_name
-        }
+    obj = {}
 
-    def _debate(d):
-        r = {}
-        if d.adjudicators.chair:
-            r['chair'] = _adj(d.adjudicators.chair)
-        r['panel'] = [_adj(a) for a in d.adjudicators.panel]
-        r['trainees'] = [_adj(a) for a in d.adjudicators.trainees]
-        return r
+    # Load every debate's panel (with institutions) in one query
+    debates = populate_adjudicators(list(debates), 'adjudicator__institution')
 
-    obj['debates'] = dict((d.id, _debate(d)) for d in debates)
-    obj['unused'] = [_adj(a) for a in unused_adj]
+    obj['debates'] = dict((d.id, _json_debate(d)) for d in debates)
+    obj['unused'] = [_json_adj(a) for a in unused_adj]
 
-    return HttpResponse(json.dumps(obj))
+    return JsonResponse(obj)
 
 
 @admin_required
@@ -1888,29 +1919,31 @@ def save_adjudicators(request, round):
         s = s.replace('[]', '')
         return int(s.split('_')[1])
 
-    debate_ids = set(id(a) for a in request.POST);
-    debates = Debate.objects.in_bulk(list(debate_ids));
-    debate_adjudicators = {}
-    for d_id, debate in debates.items():
-        a = debate.adjudicators
-        a.delete()
-        debate_adjudicators[d_id] = a
+    # Parse each key's debate ID once
+    posted = [(id(key), key, vals) for key, vals in request.POST.lists()]
 
-    for key, vals in request.POST.lists():
+    debates = Debate.objects.in_bulk(list(set(d_id for d_id, _, _ in posted)))
+    DebateAdjudicator.objects.filter(debate__in=debates.keys()).delete()
+    debate_adjudicators = dict((d_id, AdjudicatorAllocation(debate)) for d_id, debate in debates.items())
+
+    for d_id, key, vals in posted:
+        allocation = debate_adjudicators.get(d_id)
+        if allocation is None:
+            continue
         if key.startswith("chair_"):
-            debate_adjudicators[id(key)].chair = vals[0]
-        if key.startswith("panel_"):
-            for val in vals:
-                debate_adjudicators[id(key)].panel.append(val)
-        if key.startswith("trainees_"):
-            for val in vals:
-                debate_adjudicators[id(key)].trainees.append(val)
+            allocation.chair = vals[0]
+        elif key.startswith("panel_"):
+            allocation.panel.extend(vals)
+        elif key.startswith("trainees_"):
+            allocation.trainees.extend(vals)
 
     # We don't do any validity checking here, so that the adjudication
     # core can save a work in progress.
 
-    for d_id, alloc in debate_adjudicators.items():
-        alloc.save()
+    DebateAdjudicator.objects.bulk_create([DebateAdjudicator(debate_id=d_id, adjudicator_id=adj, type=t)
+            for d_id, alloc in debate_adjudicators.items() for t, adj in alloc if adj])
+    adj_history_changed()
+    update_draw_version()
 
     ActionLog.objects.log(type=ActionLog.ACTION_TYPE_ADJUDICATORS_SAVE,
         user=request.user, round=round, tournament=round.tournament)
@@ -1921,7 +1954,15 @@ def save_adjudicators(request, round):
 @admin_required
 @round_view
 def adj_conflicts(request, round):
-
+    # Cache the encoded response, since the conflicts rarely change
+    cached_key = adj_conflicts_cache_key(round)
+    content = cache.get(cached_key)
+    if content is None:
+        content = json.dumps(_adj_conflicts_data(round), separators=(',', ':'))
+        cache.set(cached_key, content, settings.ADJ_CONFLICTS_CACHE_TIMEOUT)
+    return HttpResponse(content, content_type="application/json")
+
+def _adj_conflicts_data(round):
     data = {
         'personal': {},
         'history': {},
@@ -1937,22 +1978,27 @@ def adj_conflicts(request, round):
     for ac in AdjudicatorConflict.objects.all():
         add('personal', ac.adjudicator_id, ac.team_id)
 
-    for ic in AdjudicatorInstitutionConflict.objects.all():
-        for team in Team.objects.filter(institution=ic.institution):
-            add('institutional', ic.adjudicator_id, team.id)
+    teams_by_institution = dict()
+    for institution_id, team_id in Team.objects.values_list('institution_id', 'id'):
+        teams_by_institution.setdefault(institution_id, []).append(team_id)
+
+    for adj_id, institution_id in AdjudicatorInstitutionConflict.objects.values_list('adjudicator_id', 'institution_id'):
+        for team_id in teams_by_institution.get(institution_id, []):
+            add('institutional', adj_id, team_id)
 
     for ac in AdjudicatorAdjudicatorConflict.objects.all():
-        add('adjudicator', ac.adjudicator_id, ac.conflict_adjudicator.id)
+        add('adjudicator', ac.adjudicator_id, ac.conflict_adjudicator_id)
 
+    # One row per (adjudication, team), affirmative before negative
     history = DebateAdjudicator.objects.filter(
         debate__round__seq__lt = round.seq,
-    )
+        debate__debateteam__position__in = (DebateTeam.POSITION_AFFIRMATIVE, DebateTeam.POSITION_NEGATIVE),
+    ).order_by('id', 'debate__debateteam__position').values_list('adjudicator_id', 'debate__debateteam__team_id')
 
-    for da in history:
-        add('history', da.adjudicator_id, da.debate.aff_team.id)
-        add('history', da.adjudicator_id, da.debate.neg_team.id)
+    for adj_id, team_id in history:
+        add('history', adj_id, team_id)
 
-    return HttpResponse(json.dumps(data), content_type="text/json")
+    return data
 
 
 @login_required
@@ -1967,17 +2013,28 @@ def master_sheets_list(request, round):
 def master_sheets_view(request, round, venue_group_id):
     # Temporary - pre unified venue groups
     base_venue_group = VenueGroup.objects.get(id=venue_group_id)
-    active_tournaments = Tournament.objects.filter(active=True)
-
-    for tournament in list(active_tournaments):
-        tournament.debates = Debate.objects.select_related(
-            'division','division__venue_group__short_name','round','round__tournament','aff_team','neg_team'
-        ).filter(
-            # All Debates, with a matching round, at the same venue group name
-            round__seq=round.seq,
-            round__tournament=tournament,
-            division__venue_group__short_name=base_venue_group.short_name # hack - remove when venue groups are unified
-        ).order_by('round','division__venue_group__short_name','division')
+    active_tournaments = list(Tournament.objects.filter(active=True))
+
+    # Fetch the debates for all tournaments at once, with their teams
+    debates = Debate.objects.select_related('division__venue_group', 'round').filter(
+        # All Debates, with a matching round, at the same venue group name
+        round__seq=round.seq,
+        round__tournament__in=active_tournaments,
+        division__venue_group__short_name=base_venue_group.short_name # hack - remove when venue groups are unified
+    ).order_by('round','division__venue_group__short_name','division').prefetch_related(
+        Prefetch('debateteam_set', queryset=DebateTeam.objects.select_related('team__institution')))
+
+    debates_by_tournament = dict()
+    for debate in debates:
+        for dt in debate.debateteam_set.all():
+            if dt.position == DebateTeam.POSITION_AFFIRMATIVE:
+                debate.aff_team = dt.team
+            elif dt.position == DebateTeam.POSITION_NEGATIVE:
+                debate.neg_team = dt.team
+        debates_by_tournament.setdefault(debate.round.tournament_id, []).append(debate)
+
+    for tournament in active_tournaments:
+        tournament.debates = debates_by_tournament.get(tournament.id, [])
 
     return r2r(request, 'master_sheets_view.html', dict(
         base_venue_group=base_venue_group,
@@ -1988,13 +2045,18 @@ def master_sheets_view(request, round, venue_group_id):
 @admin_required
 @tournament_view
 def adj_scores(request, t):
-    data = {}
+    cached_key = adj_scores_cache_key(t.id, t.current_round.seq)
+    data = cache.get(cached_key)
 
-    #TODO: make round-dependent
-    for adj in Adjudicator.objects.all().select_related('tournament','tournament__current_round'):
-        data[adj.id] = adj.score
+    if data is None:
+        data = {}
+        #TODO: make round-dependent
+        adjudicators = Adjudicator.objects.all().select_related('tournament','tournament__current_round')
+        for adj in populate_feedback_scores(adjudicators):
+            data[adj.id] = adj.score
+        cache.set(cached_key, data, settings.ADJ_SCORES_CACHE_TIMEOUT)
 
-    return HttpResponse(json.dumps(data), content_type="text/json")
+    return JsonResponse(data)
 
 @admin_required
 @tournament_view
@@ -2006,39 +2068,43 @@ def adj_feedback(request, t):
             'tournament','tournament__current_round')
     else:
         adjudicators = Adjudicator.objects.all()
+    # The template shows every adjudicator's score and feedback score
+    populate_feedback_scores(adjudicators)
 
     from debate.models import SpeakerScoreByAdj
-    all_debate_adjudicators = list(DebateAdjudicator.objects.select_related('adjudicator').all())
-    all_adj_scores = list(SpeakerScoreByAdj.objects.select_related('debate_adjudicator','ballot_submission').filter(
-        ballot_submission__confirmed=True))
+    # Index adjudications and scores by adjudicator up front (two queries),
+    # rather than filtering them again for each adjudicator
+    debate_adjudicator_types = dict()
+    debates_by_adj = dict()
+    for adj_id, debate_id, da_type in DebateAdjudicator.objects.filter(
+            adjudicator__in=adjudicators).values_list('adjudicator_id', 'debate_id', 'type'):
+        debate_adjudicator_types[(adj_id, debate_id)] = da_type
+        debates_by_adj[adj_id] = debates_by_adj.get(adj_id, 0) + 1
+
+    scores_by_adj = dict()
+    team_totals_by_adj = dict() # adj_id -> ballot_id -> debate_team_id -> total
+    for adj_id, ballot_id, debate_team_id, score in SpeakerScoreByAdj.objects.filter(
+            ballot_submission__confirmed=True, debate_adjudicator__adjudicator__in=adjudicators).values_list(
+            'debate_adjudicator__adjudicator_id', 'ballot_submission_id', 'debate_team_id', 'score'):
+        scores_by_adj.setdefault(adj_id, []).append(score)
+        team_totals = team_totals_by_adj.setdefault(adj_id, {}).setdefault(ballot_id, {})
+        team_totals[debate_team_id] = team_totals.get(debate_team_id, 0) + score
 
     # Processing scores to get average margins
     for adj in adjudicators:
-        adj_debateadjudications  = [a for a in all_debate_adjudicators if a.adjudicator is adj]
-        adj_scores = [s for s in all_adj_scores if s.debate_adjudicator is adj_debateadjudications]
+        adj_scores = scores_by_adj.get(adj.id)
 
-        adj.debates = len(adj_debateadjudications)
+        adj.debates = debates_by_adj.get(adj.id, 0)
         if adj.breaking:
             breaking_count += 1
 
-        if len(adj_scores) > 0:
-            adj.avg_score = sum(s.score for s in adj_scores) / len(adj_scores)
+        if adj_scores:
+            adj.avg_score = sum(adj_scores) / len(adj_scores)
 
-            ballot_ids = []
             ballot_margins = []
-            for score in adj_scores:
-                ballot_ids.append(score.ballot_submission)
-
-            ballot_ids = sorted(set([b.id for b in ballot_ids])) # Deduplication of ballot IDS
-
-            for ballot_id in ballot_ids:
-                # For each unique ballot id, total its scores
-                single_round = adj_scores.filter(ballot_submission=ballot_id)
-                scores = [s.score for s in single_round] # TODO this is slow - should be prefetched
-                slice_end = len(scores)
-                teamA = sum(scores[:len(scores)/2])
-                teamB = sum(scores[len(scores)/2:])
-                ballot_margins.append(max(teamA, teamB) - min(teamA, teamB))
+            for team_totals in team_totals_by_adj[adj.id].itervalues():
+                # For each ballot, the difference between the teams' totals
+                ballot_margins.append(max(team_totals.values()) - min(team_totals.values()))
 
             adj.avg_margin = sum(ballot_margins) / len(ballot_margins)
 
@@ -2046,31 +2112,35 @@ def adj_feedback(request, t):
             adj.avg_score = None
             adj.avg_margin = None
 
-    all_adj_feedbacks = list(AdjudicatorFeedback.objects.filter(
-            confirmed=True).exclude(source_adjudicator__type=DebateAdjudicator.TYPE_TRAINEE).select_related(
-        'adjudicator', 'source_adjudicator__debate__round', 'source_team__debate__round'))
+    # Only this page's adjudicators' feedback, indexed by adjudicator, so that
+    # each adjudicator's feedback isn't found by scanning everyone's
+    feedbacks_by_adj = dict()
+    for f in AdjudicatorFeedback.objects.filter(confirmed=True, adjudicator__in=adjudicators).exclude(
+            source_adjudicator__type=DebateAdjudicator.TYPE_TRAINEE).select_related(
+            'source_adjudicator__debate', 'source_team__debate'):
+        feedbacks_by_adj.setdefault(f.adjudicator_id, []).append(f)
     rounds = t.prelim_rounds(until=t.current_round)
 
     # Filtering/summing feedback by round for the graphs (faster than a model method)
     for adj in adjudicators:
         adj.rscores = []
-        adj_feedbacks = [f for f in all_adj_feedbacks if f.adjudicator == adj]
+        adj_feedbacks = feedbacks_by_adj.get(adj.id, [])
         for r in rounds:
-            adj_round_feedbacks = [f for f in adj_feedbacks if (f.source_adjudicator and f.source_adjudicator.debate.round == r)]
-            adj_round_feedbacks.extend([f for f in adj_feedbacks if (f.source_team and f.source_team.debate.round == r)])
+            adj_round_feedbacks = [f for f in adj_feedbacks if (f.source_adjudicator and f.source_adjudicator.debate.round_id == r.id)]
+            adj_round_feedbacks.extend([f for f in adj_feedbacks if (f.source_team and f.source_team.debate.round_id == r.id)])
 
             if len(adj_round_feedbacks) > 0:
                 # Getting the position of the adj
                 # We grab both so there is at least one valid debate, then lookup the debate adjudicator for that
                 debates = [fb.source_team.debate for fb in adj_round_feedbacks if fb.source_team]
                 debates.extend([fb.source_adjudicator.debate for fb in adj_round_feedbacks if fb.source_adjudicator])
-                adj_da = next((da for da in all_debate_adjudicators if (da.adjudicator == adj and da.debate == debates[0])), None)
+                da_type = debate_adjudicator_types.get((adj.id, debates[0].id))
 
-                if adj_da.type == adj_da.TYPE_CHAIR:
+                if da_type == DebateAdjudicator.TYPE_CHAIR:
                     adj_type = "Chair"
-                elif adj_da.type == adj_da.TYPE_PANEL:
+                elif da_type == DebateAdjudicator.TYPE_PANEL:
                     adj_type = "Panellist"
-                elif adj_da.type == adj_da.TYPE_TRAINEE:
+                elif da_type == DebateAdjudicator.TYPE_TRAINEE:
                     adj_type = "Trainee"
 
                 # Average their scores for that round
@@ -2168,11 +2238,11 @@ def get_adj_feedback(request, t):
             source_annotation = ""
 
         data = [
-            unicode(f.round.abbreviation),
-            unicode(str(f.version) + (f.confirmed and "*" or "")),
+            f.round.abbreviation,
+            str(f.version) + (f.confirmed and "*" or ""),
             f.debate.bracket,
             f.debate.matchup,
-            unicode(str(f.source) + source_annotation),
+            unicode(f.source) + source_annotation,
             f.score,
         ]
         for question in questions:
@@ -2183,7 +2253,7 @@ def get_adj_feedback(request, t):
         data.append(f.confirmed)
         return data
     data = [_parse_feedback(f) for f in feedback]
-    return HttpResponse(json.dumps({'aaData': data}), content_type="text/json")
+    return JsonResponse({'aaData': data})
 
 # Don't cache
 @public_optional_tournament_view('public_feedback_randomised')
@@ -2281,18 +2351,22 @@ def get_debate_from_ballot_checkin_request(request, round):
     # Returns the message that should go in the "success" field.
     v = request.POST.get('venue')
 
+    # Look the venue up through this round's debates, so that the name is only
+    # compared against the venues in use this round. Count the round's ballots
+    # that are still out in the same query, since both callers report it.
     try:
-        venue = Venue.objects.get(name__iexact=v)
-    except Venue.DoesNotExist:
-        raise DebateBallotCheckinError('There aren\'t any venues with the name "' + v + '".')
-
-    try:
-        debate = Debate.objects.get(round=round, venue=venue)
+        debate = Debate.objects.select_related('venue').extra(select={'ballots_left': """SELECT COUNT(*)
+                FROM debate_debate d
+                WHERE d.round_id = debate_debate.round_id AND NOT d.ballot_in"""}).get(
+                round=round, venue__name__iexact=v)
     except Debate.DoesNotExist:
+        venue = Venue.objects.filter(name__iexact=v).first()
+        if venue is None:
+            raise DebateBallotCheckinError('There aren\'t any venues with the name "' + v + '".')
         raise DebateBallotCheckinError('There wasn\'t a debate in venue ' + venue.name + ' this round.')
 
     if debate.ballot_in:
-        raise DebateBallotCheckinError('The ballot for venue ' + venue.name + ' has already been checked in.')
+        raise DebateBallotCheckinError('The ballot for venue ' + debate.venue.name + ' has already been checked in.')
 
     return debate
 
@@ -2307,7 +2381,7 @@ def ballot_checkin_get_details(request, round):
         debate = get_debate_from_ballot_checkin_request(request, round)
     except DebateBallotCheckinError, e:
         data = {'exists': False, 'message': str(e)}
-        return HttpResponse(json.dumps(data))
+        return JsonResponse(data)
 
     obj = dict()
 
@@ -2321,9 +2395,9 @@ def ballot_checkin_get_details(request, round):
     obj['num_adjs'] = len(adj_names)
     obj['adjudicators'] = adj_names
 
-    obj['ballots_left'] = ballot_checkin_number_left(round)
+    obj['ballots_left'] = debate.ballots_left
 
-    return HttpResponse(json.dumps(obj))
+    return JsonResponse(obj)
 
 @admin_required
 @round_view
@@ -2332,7 +2406,7 @@ def post_ballot_checkin(request, round):
         debate = get_debate_from_ballot_checkin_request(request, round)
     except DebateBallotCheckinError, e:
         data = {'exists': False, 'message': str(e)}
-        return HttpResponse(json.dumps(data))
+        return JsonResponse(data)
 
     debate.ballot_in = True
     debate.save()
@@ -2346,9 +2420,10 @@ def post_ballot_checkin(request, round):
     obj['venue'] = debate.venue.name
     obj['debate_description'] = debate.aff_team.short_name + " vs " + debate.neg_team.short_name
 
-    obj['ballots_left'] = ballot_checkin_number_left(round)
+    # ballots_left was counted before this ballot was checked in
+    obj['ballots_left'] = debate.ballots_left - 1
 
-    return HttpResponse(json.dumps(obj))
+    return JsonResponse(obj)
 
 @admin_required
 @tournament_view
@@ -81,6 +81,10 @@ LOGIN_REDIRECT_URL = '/'
 
 PUBLIC_PAGE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_PAGE_CACHE_TIMEOUT', 60 * 1))
 TAB_PAGES_CACHE_TIMEOUT = int(os.environ.get('TAB_PAGES_CACHE_TIMEOUT', 60 * 120))
+STANDINGS_CACHE_TIMEOUT = int(os.environ.get('STANDINGS_CACHE_TIMEOUT', 60 * 10))
+ADJ_SCORES_CACHE_TIMEOUT = int(os.environ.get('ADJ_SCORES_CACHE_TIMEOUT', 60 * 5))
+ADJ_CONFLICTS_CACHE_TIMEOUT = int(os.environ.get('ADJ_CONFLICTS_CACHE_TIMEOUT', 60 * 60))
+BARCODE_CACHE_TIMEOUT = int(os.environ.get('BARCODE_CACHE_TIMEOUT', 60 * 60))
 
 # Default non-heroku cache is to use local memory
 CACHES = {
@@ -244,7 +244,7 @@ $('#auto_allocate').click(function() {
     url: "{% round_url create_adj_allocation %}",
     success: function(data, status) {
       reset();
-      load_allocation_data($.parseJSON(data));
+      load_allocation_data(data);
       update_all_conflicts();
       append_adj_scores();
       $('#loading').hide();